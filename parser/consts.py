@@ -1,4 +1,6 @@
 import os
+from typing import NamedTuple
+
 from loguru import logger
 
 HOME_PATH = os.path.dirname(os.path.dirname(__file__))
@@ -11,6 +13,20 @@ def get_bool_from_env(name: str, default: bool, log_value=True):
     return val
 
 
+def get_float_from_env(name: str, default: float, log_value=True, minimum: float = None):
+    try:
+        val = float(os.environ.get(name, default=str(default)))
+    except ValueError:
+        logger.warning(f"{name} is not a number, using {default}")
+        val = float(default)
+    if minimum is not None and not val >= minimum:  # not >= catches nan too
+        logger.warning(f"{name} must be at least {minimum}, using {default}")
+        val = float(default)
+    if log_value:
+        logger.info(name + "=" + str(val))
+    return val
+
+
 class Network:
     CLEARNET = "instances"
     ONION = "onion"
@@ -18,6 +34,9 @@ class Network:
     LOKI = "loki"
 
 
+NETWORK_TLDS = {"onion": Network.ONION, "i2p": Network.I2P, "loki": Network.LOKI}  # anything else is clearnet
+
+
 class MirrorHeaders:
     ONION = "onion-location"
     I2P = "x-i2p-location"
@@ -31,6 +50,73 @@ class Retries:
     trace_errors = get_bool_from_env("FIL_TRACE_ERRORS", True)
 
 
+class HostLimit(NamedTuple):
+    rate: float  # requests per second
+    burst: int  # requests allowed at once after idling
+    concurrency: int  # requests in flight
+
+
+class RateLimits:
+    default = HostLimit(rate=2, burst=4, concurrency=4)
+    per_host = {
+        "raw.githubusercontent.com": HostLimit(rate=5, burst=10, concurrency=6),
+        "codeberg.org": HostLimit(rate=1, burst=2, concurrency=2),
+        "raw.codeberg.page": HostLimit(rate=1, burst=2, concurrency=2),
+    }
+    scale = get_float_from_env("FIL_RATE_SCALE", 1.0, minimum=0.001)  # multiplies every rate
+    concurrency = int(get_float_from_env("FIL_MAX_CONCURRENCY", 32, minimum=1))  # requests in flight across all hosts
+
+    retries_on_limit = 3  # re-requests after 429 / Retry-After
+    backoff_on_limit = 10  # seconds, when 429 comes without Retry-After
+    max_retry_after = 120
+
+
+class Deadlines:
+    run = get_float_from_env("FIL_RUN_BUDGET", 0, minimum=0)  # seconds for whole run, 0 is no limit
+    source = get_float_from_env("FIL_SOURCE_DEADLINE", 600, minimum=0)  # seconds for one source, 0 is no limit
+
+
+class Refresh:
+    # seconds between scrapes of one group in daemon mode, adapted from how often its lists change
+    cron = 7 * 24 * 60 * 60  # cadence of scheduled workflow (parse.yml)
+    default = cron  # unseen groups start no more often than cron, changes shrink it
+    min_ = 15 * 60
+    max_ = 7 * 24 * 60 * 60
+    on_change = 0.5  # interval multiplier when something changed
+    on_same = 1.5  # and when nothing did
+
+    state_file = ".schedule.json"  # in HOME_PATH, keeps learned intervals between restarts
+
+
+class Server:
+    enabled = get_bool_from_env("FIL_SERVE", False)
+    host = os.environ.get("FIL_SERVE_HOST", "127.0.0.1")
+    port = int(os.environ.get("FIL_SERVE_PORT", 8080))
+    gzip_min_size = 256  # smaller bodies aren't worth compressing
+    max_header_lines = 100
+
+
+class Profile:
+    enabled = get_bool_from_env("FIL_PROFILE", False)
+    memory = get_bool_from_env("FIL_PROFILE_MEMORY", False)  # tracemalloc snapshots per stage, much slower
+    folder = "profiles"  # in HOME_PATH
+    memory_frames = 1
+    memory_top = 10  # allocation lines kept per stage
+    lag_interval = 0.05  # seconds between event loop lag samples
+
+
+class RegexSafety:
+    budget = get_float_from_env("FIL_REGEX_BUDGET", 10, minimum=0)  # seconds of matching for one source, 0 is no limit
+    # analyzer (tests/regex_compile.py)
+    sizes = (256, 512, 1024, 2048, 4096)  # pumped input lengths
+    attempt_timeout = 2  # seconds for one match, exceeded means exponential
+    min_measurable = 0.002  # faster matches are linear enough, timer noise otherwise
+    linear = 1.5  # growth exponents below are fine
+    polynomial = 2.5  # below are warned, above fail
+    unbounded_from = 64  # {n,m} with bigger m backtracks like unbounded
+    max_shared_chars = 4  # chars of class tried in overlapping pumps
+
+
 class Regex:
     # https://stackoverflow.com/questions/7930751/regexp-for-subdomain
     # TODO: make less stupid regex
@@ -50,14 +136,14 @@ class Regex:
 INST_FOLDER = "instances"
 
 LOG_DOMAIN_FROM_HEADERS = get_bool_from_env("FIL_LOG_DOMAIN_FROM_HEADERS", True)
+WRITE_META = get_bool_from_env("FIL_WRITE_META", False)  # <network>.meta.json with source and metadata of each instance
 
 
 ENABLE_ASYNC = get_bool_from_env("FIL_ENABLE_ASYNC", True)
+ENABLE_DAEMON = get_bool_from_env("FIL_DAEMON", False)
 ENABLE_PATH_IN_DOMAINS = False
 IGNORE_DOMAINS_WITH_PATHS = True
-SLEEP_TIMEOUT_PER_GROUP = 3
 SLEEP_TIMEOUT_PER_TIMEOUT = 3
-SLEEP_TIMEOUT_PER_CHECK = 1
 TIMEOUTS_MAX = 3
 HEADERS = {"User-Agent": "@NoPlagiarism / frontend-instances-scraper"}
 ESCAPE_DUPLICATES = True
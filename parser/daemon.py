@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import time
+
+from loguru import logger
+
+try:
+    from .consts import HOME_PATH, PRIORITIES, Refresh, Server
+    from .engine import ENGINE
+    from .profiling import PROFILER
+    from .main import INSTANCE_GROUPS, InstancesGroupData, RunReport, should_skip_instance_group
+    from . import generate_md_json
+except ImportError:
+    from consts import HOME_PATH, PRIORITIES, Refresh, Server
+    from engine import ENGINE
+    from profiling import PROFILER
+    from main import INSTANCE_GROUPS, InstancesGroupData, RunReport, should_skip_instance_group
+    import generate_md_json
+
+STATE_FILE = os.path.join(HOME_PATH, Refresh.state_file)
+
+
+class GroupSchedule:
+    def __init__(self, group: InstancesGroupData, interval=None, last_run=None):
+        self.group = group
+        self.interval = interval or group.refresh_interval or Refresh.default
+        self.last_run = last_run
+
+    def seconds_left(self):
+        if self.last_run is None:
+            return 0
+        return max(self.last_run + self.interval - time.time(), 0)
+
+    def adjust(self, changed):
+        self.last_run = time.time()
+        # failed refresh tells nothing about upstream, outage shouldn't stretch the interval
+        if changed is None:
+            return
+        interval = self.interval * (Refresh.on_change if changed else Refresh.on_same)
+        self.interval = min(max(interval, Refresh.min_), Refresh.max_)
+
+    def to_json(self):
+        return {"interval": self.interval, "last_run": self.last_run}
+
+
+class Scheduler:
+    """Refreshes every group on its own interval, interval shrinks when upstream changes and grows when it doesn't"""
+
+    def __init__(self, groups, state_file=STATE_FILE):
+        self.state_file = state_file
+        state = self.load_state()
+        self.schedules = [GroupSchedule(group, **state.get(group.get_name(), dict())) for group in groups]
+        self.on_refresh = list()  # callables (group) called after group's lists changed
+
+    def load_state(self):
+        if not os.path.exists(self.state_file):
+            return dict()
+        try:
+            with open(self.state_file, mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Schedule state not loaded ({e})")
+            return dict()
+
+    def save_state(self):
+        with open(self.state_file, mode="w+", encoding="utf-8") as f:
+            json.dump({x.group.get_name(): x.to_json() for x in self.schedules}, f, indent=4)
+
+    @staticmethod
+    async def refresh(group: InstancesGroupData):
+        report = RunReport()
+        for p in PRIORITIES:
+            await asyncio.gather(*map(report.run_source, group.from_instance().get_providers(priority=p)))
+        report.log(group.name)
+        PROFILER.dump("daemon", groups=(group.relative_filepath_without_ext, ))
+        return report.get_outcome()
+
+    async def run_schedule(self, schedule: GroupSchedule):
+        while True:
+            await asyncio.sleep(schedule.seconds_left())
+            try:
+                changed = await self.refresh(schedule.group)
+            except Exception as e:
+                logger.exception(f"{schedule.group.name} refresh failed due err {type(e)}")
+                changed = None
+            schedule.adjust(changed)
+            self.save_state()
+            outcome = {True: "changed", False: "unchanged", None: "failed"}[changed]
+            logger.info(f"{schedule.group.name} {outcome}, next refresh in {schedule.interval / 60:.0f}min")
+            if changed:
+                self.notify(schedule.group)
+
+    def notify(self, group: InstancesGroupData):
+        for callback in self.on_refresh:
+            # one broken callback mustn't stop others or the schedule
+            try:
+                callback(group)
+            except Exception as e:
+                logger.exception(f"{group.name} refresh callback {callback} failed due err {type(e)}")
+
+    async def run(self):
+        async with ENGINE, PROFILER.watch_loop():
+            await asyncio.gather(*map(self.run_schedule, self.schedules))
+
+
+def regenerate(group: InstancesGroupData):
+    generate_md_json.handle_instance(group)
+    generate_md_json.create_all_json(INSTANCE_GROUPS)
+    generate_md_json.create_all_md(INSTANCE_GROUPS)
+    generate_md_json.create_manifest(INSTANCE_GROUPS)
+
+
+def get_scheduler():
+    scheduler = Scheduler([x for x in INSTANCE_GROUPS if not should_skip_instance_group(x)])
+    scheduler.on_refresh.append(regenerate)
+    return scheduler
+
+
+async def run_with_server():
+    try:
+        from .server import InstancesServer
+    except ImportError:
+        from server import InstancesServer
+    scheduler = get_scheduler()
+    server = InstancesServer()
+    scheduler.on_refresh.append(server.reload)
+    async with await server.start():
+        await scheduler.run()
+
+
+@logger.catch(reraise=True)
+def run():
+    if Server.enabled:
+        asyncio.run(run_with_server())
+    else:
+        asyncio.run(get_scheduler().run())
+
+
+if __name__ == "__main__":
+    run()
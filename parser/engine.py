@@ -0,0 +1,73 @@
+import asyncio
+
+from loguru import logger
+
+try:
+    from .consts import HEADERS, RateLimits, SLEEP_TIMEOUT_PER_TIMEOUT, TIMEOUTS_MAX
+    from .limiter import LIMITER, RateLimited, get_host
+except ImportError:
+    from consts import HEADERS, RateLimits, SLEEP_TIMEOUT_PER_TIMEOUT, TIMEOUTS_MAX
+    from limiter import LIMITER, RateLimited, get_host
+
+
+class Engine:
+    """One pooled client for every fetch; rate limit, Retry-After and timeout retries live here"""
+
+    def __init__(self, limiter=LIMITER):
+        self.limiter = limiter
+        self.client = None
+        self._client_loop = None
+        self._sessions = 0
+
+    async def __aenter__(self):
+        self._sessions += 1
+        self.get_client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._sessions -= 1
+        if self._sessions == 0:
+            await self.close()
+
+    def get_client(self):
+        # client's pool is bound to loop, sync path runs new loop per call
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            import httpx  # heavy, imported only when something's fetched
+            self.client = httpx.AsyncClient(headers=HEADERS)
+            self._client_loop = loop
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self._client_loop = None
+
+    async def request(self, method, url, **kwargs):
+        import httpx
+        client = self.get_client()
+        for timeouts in range(TIMEOUTS_MAX + 1):
+            try:
+                for _ in range(RateLimits.retries_on_limit + 1):
+                    async with self.limiter.limit(url):
+                        resp = await client.request(method, url, **kwargs)
+                    if self.limiter.on_response(url, resp) is None:
+                        return resp
+                # body of 429 isn't data, source must fail and keep its previous list
+                raise RateLimited(f"{get_host(url)} still responds {resp.status_code} "
+                                  f"after {RateLimits.retries_on_limit} retries")
+            except httpx.ConnectTimeout:
+                if timeouts == TIMEOUTS_MAX:
+                    raise
+                logger.info(f"{url} connect timeout, try {timeouts + 1} of {TIMEOUTS_MAX}")
+                await asyncio.sleep(SLEEP_TIMEOUT_PER_TIMEOUT)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+
+ENGINE = Engine()
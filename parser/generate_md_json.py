@@ -1,16 +1,29 @@
+import gzip
+import hashlib
 import json
 import os
 
 from loguru import logger
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 try:
     from .consts import INST_FOLDER, Network
+    from .profiling import PROFILER
     from .main import HOME_PATH, INSTANCE_GROUPS, BaseInstance, InstancesGroupData
 except ImportError:
     from consts import INST_FOLDER, Network
+    from profiling import PROFILER
     from main import HOME_PATH, INSTANCE_GROUPS, BaseInstance, InstancesGroupData
 
 
+COMPRESSED_EXTENSIONS = {"gzip": ".gz", "br": ".br"}
+MANIFEST_FILEPATH = os.path.join(HOME_PATH, INST_FOLDER, "manifest.json")
+
+
 def md_url_generator(data: BaseInstance, http=False):
     domains = data.load_from_json()
     protocol = "https://" if not http else "http://"
@@ -27,9 +40,37 @@ def save_md(content, filepath):
         f.write(content)
 
 
-def save_json(obj, filepath):
+def save_json(obj, filepath, minified=False):
     with open(filepath, mode="w+", encoding="utf-8") as f:
         json.dump(obj, f, indent=4)
+    if minified:
+        save_minified_json(obj, filepath)
+
+
+def get_minified_filepath(filepath):
+    return os.path.splitext(filepath)[0] + ".min.json"
+
+
+def compress(data: bytes):
+    # mtime=0 so unchanged lists give byte-identical files and hashes
+    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data, quality=11)
+    return compressed
+
+
+def save_minified_json(obj, filepath):
+    data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    min_filepath = get_minified_filepath(filepath)
+    with open(min_filepath, mode="wb+") as f:
+        f.write(data)
+    compressed = compress(data)
+    for encoding, ext in COMPRESSED_EXTENSIONS.items():
+        if encoding in compressed:
+            with open(min_filepath + ext, mode="wb+") as f:
+                f.write(compressed[encoding])
+        elif os.path.exists(min_filepath + ext):
+            os.remove(min_filepath + ext)  # would be stale otherwise
 
 
 def create_instance_group_readme(metadata: InstancesGroupData, save=True, header=1):
@@ -50,18 +91,23 @@ def create_instance_group_readme(metadata: InstancesGroupData, save=True, header
         return md
 
 
-def create_instance_group_json(metadata: InstancesGroupData):
+def get_instance_group_json(metadata: InstancesGroupData):
     data = metadata.from_instance()
-    json_raw = {inst.relative_filepath_without_ext: inst.load_from_json() for inst in data.instances}
-    save_json(json_raw, os.path.join(data.inst.get_folderpath(), "all.json"))
+    return {inst.relative_filepath_without_ext: inst.load_from_json() for inst in data.instances}
+
+
+def create_instance_group_json(metadata: InstancesGroupData):
+    save_json(get_instance_group_json(metadata), os.path.join(metadata.get_folderpath(), "all.json"), minified=True)
 
 
 def handle_instance(metadata):
-    create_instance_group_readme(metadata)
-    create_instance_group_json(metadata)
+    with PROFILER.stage(metadata.relative_filepath_without_ext, "generate.readme"):
+        create_instance_group_readme(metadata)
+    with PROFILER.stage(metadata.relative_filepath_without_ext, "generate.json"):
+        create_instance_group_json(metadata)
 
 
-def create_all_json(groups_data):
+def get_all_json(groups_data):
     groups = [x.from_instance() for x in groups_data]
     json_raw = dict()
     for group in groups:
@@ -70,7 +116,11 @@ def create_all_json(groups_data):
             json_raw[group.inst.get_name()]["desc"] = group.inst.description
         for inst in group.instances:
             json_raw[group.inst.get_name()][inst.relative_filepath_without_ext] = inst.load_from_json()
-    save_json(json_raw, os.path.join(HOME_PATH, INST_FOLDER, "all.json"))
+    return json_raw
+
+
+def create_all_json(groups_data):
+    save_json(get_all_json(groups_data), os.path.join(HOME_PATH, INST_FOLDER, "all.json"), minified=True)
 
 
 def create_all_md(groups_data):
@@ -83,11 +133,52 @@ def create_all_md(groups_data):
     save_md(md, os.path.join(HOME_PATH, INST_FOLDER, "all.md"))
 
 
+def get_file_info(filepath):
+    with open(filepath, mode="rb") as f:
+        data = f.read()
+    return {"path": os.path.relpath(filepath, os.path.join(HOME_PATH, INST_FOLDER)).replace(os.sep, "/"),
+            "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def get_manifest_entry(filepath):
+    entry = get_file_info(filepath)
+    min_filepath = get_minified_filepath(filepath)
+    # groups not regenerated since minified output was added have no variants yet
+    if os.path.exists(min_filepath):
+        entry["min"] = get_file_info(min_filepath)
+    for encoding, ext in COMPRESSED_EXTENSIONS.items():
+        if os.path.exists(min_filepath + ext):
+            entry[encoding] = get_file_info(min_filepath + ext)
+    return entry
+
+
+def log_savings(entries):
+    total = sum(x["size"] for x in entries)
+    summary = [f"{len(entries)} json files: {total / 1024:.1f}KB indented"]
+    for variant in ("min", ) + tuple(COMPRESSED_EXTENSIONS):
+        if not all(variant in x for x in entries):
+            continue
+        size = sum(x[variant]["size"] for x in entries)
+        summary.append(f"{size / 1024:.1f}KB {variant} (-{(1 - size / total) * 100:.0f}%)")
+    logger.info(", ".join(summary))
+
+
+def create_manifest(groups_data):
+    manifest = {"all": get_manifest_entry(os.path.join(HOME_PATH, INST_FOLDER, "all.json")),
+                "groups": {x.get_name(): get_manifest_entry(os.path.join(x.get_folderpath(), "all.json")) for x in groups_data}}
+    save_json(manifest, MANIFEST_FILEPATH)
+    log_savings([manifest["all"], *manifest["groups"].values()])
+
+
 @logger.catch(reraise=True)
 def run():
+    if brotli is None:
+        logger.warning("brotli isn't installed, .br files are skipped")
     tuple(map(handle_instance, INSTANCE_GROUPS))
-    create_all_json(INSTANCE_GROUPS)
-    create_all_md(INSTANCE_GROUPS)
+    for name, renderer in (("json", create_all_json), ("md", create_all_md), ("manifest", create_manifest)):
+        with PROFILER.stage("all", f"generate.{name}"):
+            renderer(INSTANCE_GROUPS)
+    PROFILER.dump("generate")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from loguru import logger
+
+try:
+    from .consts import RateLimits, HostLimit
+except ImportError:
+    from consts import RateLimits, HostLimit
+
+
+class RateLimited(Exception):
+    """Host kept answering 429/503 with Retry-After after every retry"""
+
+
+def get_host(url):
+    return urlparse(str(url)).hostname or ""
+
+
+def parse_retry_after(value):
+    """Retry-After is either delay in seconds or HTTP-date"""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    if not math.isfinite(delay):
+        return None
+    return min(max(delay, 0.0), RateLimits.max_retry_after)
+
+
+class TokenBucket:
+    def __init__(self, limit: HostLimit, scale=1.0):
+        self.rate = limit.rate * scale
+        self.burst = limit.burst
+        self.concurrency = limit.concurrency
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def reserve(self):
+        """Takes token (even if it's not there yet) and returns how long to wait before using it"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(delay, self.blocked_until - now)
+
+    def block_for(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def get_semaphore(self):
+        # asyncio primitives are bound to loop, sync update() runs new loop per call
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+
+class HostRateLimiter:
+    def __init__(self, default: HostLimit = RateLimits.default, per_host: dict = None,
+                 concurrency: int = RateLimits.concurrency, scale: float = RateLimits.scale):
+        self.default = default
+        self.per_host = RateLimits.per_host if per_host is None else per_host
+        self.concurrency = concurrency
+        self.scale = scale
+        self.buckets = dict()
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def get_bucket(self, url) -> TokenBucket:
+        host = get_host(url)
+        if (bucket := self.buckets.get(host)) is None:
+            bucket = self.buckets[host] = TokenBucket(self.per_host.get(host, self.default), self.scale)
+        return bucket
+
+    def get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def limit(self, url):
+        bucket = self.get_bucket(url)
+        # global slot is taken last, requests waiting on a slow host mustn't hold slots of others
+        async with bucket.get_semaphore():
+            if (delay := bucket.reserve()) > 0:
+                await asyncio.sleep(delay)
+            async with self.get_semaphore():
+                yield
+
+    def on_response(self, url, response):
+        """Returns delay if host asked to slow down, None otherwise"""
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if response.status_code == 429:
+            delay = RateLimits.backoff_on_limit if retry_after is None else retry_after
+        elif response.status_code == 503 and retry_after is not None:
+            delay = retry_after
+        else:
+            return None
+        logger.info(f"{get_host(url)} responded {response.status_code}, slowing down for {delay:.1f}s")
+        self.get_bucket(url).block_for(delay)
+        return delay
+
+
+LIMITER = HostRateLimiter()
@@ -1,19 +1,30 @@
 import asyncio
+import copy
 import json
 import os
 import re
 import time
 from dataclasses import dataclass
-from typing import Callable, Iterable, Optional, Union, Any
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union, Any
 
-import httpx
 from loguru import logger
 
 try:
     from .consts import *
+    from .engine import ENGINE
+    from .limiter import RateLimited
+    from .profiling import PROFILER
+    from .records import InstanceRecord, to_records
+    from .regexsafety import Budget, RegexBudgetExceeded, compile_pattern
+    from .utils import get_domain_from_url, split_by_network
 except ImportError:
     from consts import *
+    from engine import ENGINE
+    from limiter import RateLimited
+    from profiling import PROFILER
+    from records import InstanceRecord, to_records
+    from regexsafety import Budget, RegexBudgetExceeded, compile_pattern
+    from utils import get_domain_from_url, split_by_network
 
 
 class URLForCache:
@@ -26,7 +37,10 @@ class URLForCache:
         return self.data is not None
 
 
-URL = Union[httpx.URL, str, URLForCache]
+if TYPE_CHECKING:
+    import httpx
+
+URL = Union["httpx.URL", str, URLForCache]
 
 
 @dataclass
@@ -65,6 +79,10 @@ class BaseInstance:
         with open(self.get_filepath(".json"), mode="r", encoding="utf-8") as f:
             return json.load(f)
 
+    def save_records_as_meta_json(self, records):
+        with open(self.get_filepath(".meta.json"), mode="w+", encoding="utf-8") as f:
+            json.dump([x.to_json() for x in records], f, indent=4)
+
     def save_list_as_txt(self, obj):
         to_save = "\n".join(obj)
         with open(self.get_filepath(".txt"), mode="w+", encoding="utf-8") as f:
@@ -73,57 +91,18 @@ class BaseInstance:
     def get_url(self):
         return self.__dict__.get("url")
 
-    def cache_response(self, response, url=None):
-        if url is None:
-            if (url := self.get_url()) is None:
-                raise TypeError("cache_response url can't be None")
-        if isinstance(url, URLForCache):
-            url.data = response
-        elif self.parent:
-            self.parent.cache_response(url, response)
-
-    def get_cached_response(self, url=None):
-        if url is None:
-            if (url := self.get_url()) is None:
-                raise TypeError("get_cached_response url can't be None")
-        if isinstance(url, URLForCache):
-            if url.loaded:
-                return url.data
-        elif self.parent:
-            return self.parent.get_cached_response(url)
-
-    def get(self, url=None, **kwargs):
-        if url is None:
-            if (url := self.get_url()) is None:
-                raise TypeError("url can't be None")
-        if (resp := self.get_cached_response(url)) is not None:
-            return resp
-        if 'headers' not in kwargs:
-            kwargs['headers'] = HEADERS
-        if isinstance(url, URLForCache):
-            raw_url = url.url
-        else:
-            raw_url = url
-        resp = httpx.get(raw_url, **kwargs)
-        self.cache_response(resp, url)
-        return resp
-
     async def a_get(self, url=None, **kwargs):
         if url is None:
             if (url := self.get_url()) is None:
                 raise TypeError("url can't be None")
-        if (resp := self.get_cached_response(url)) is not None:
-            return resp
-        if 'headers' not in kwargs:
-            kwargs['headers'] = HEADERS
         if isinstance(url, URLForCache):
-            raw_url = url.url
-        else:
-            raw_url = url
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(raw_url, **kwargs)
-        self.cache_response(resp, url)
-        return resp
+            if not url.loaded:
+                url.data = await ENGINE.get(url.url, **kwargs)
+            return url.data
+        if self.parent is not None:
+            # every source of group shares one in-flight request per url
+            return await self.parent.get_cached(url, lambda: ENGINE.get(url, **kwargs))
+        return await ENGINE.get(url, **kwargs)
 
 
 class BaseDomainsProvider:
@@ -136,97 +115,119 @@ class BaseDomainsProvider:
         return not (domains == domains_old)
 
     @staticmethod
-    def check_domain(domain):
+    async def check_domain(domain):
         try:
-            httpx.head("https://" + domain, headers=HEADERS)
-            time.sleep(SLEEP_TIMEOUT_PER_CHECK)
+            await ENGINE.head("https://" + domain)
             return True
-        except:
+        except Exception:
             return False
 
-    def check_duplicates(self, domains):
-        no_duplicates = list(set(domains))
-        if len(no_duplicates) != len(domains):
-            dups = [x for x in no_duplicates if domains.count(x) > 1]
-            logger.info(f"{self.inst.get_relative_without_ext()} duplicates: " + ", ".join(dups))
-            return no_duplicates
-        else:
-            return domains
+    def check_duplicates(self, records):
+        unique = dict()
+        dups = set()
+        for record in records:
+            if record.domain in unique:
+                dups.add(record.domain)
+                continue
+            unique[record.domain] = record
+        if dups:
+            logger.info(f"{self.inst.get_relative_without_ext()} duplicates: " + ", ".join(sorted(dups)))
+        return list(unique.values())
+
+    def get_source(self):
+        url = self.inst.get_url()
+        return url.url if isinstance(url, URLForCache) else url
+
+    def to_records(self, items):
+        return to_records(items, self.inst.relative_filepath_without_ext, self.get_source())
 
     def _log_exc_type_on_try(self, exc, try_num):
         logger.info(f"{self.inst.get_relative_without_ext()} couldn't update due err {type(exc)} on try {try_num}")
 
     @staticmethod
-    def _sleep_before_another_try(try_num=0):
-        time.sleep(Retries.sleep * (try_num * Retries.sleep_multiplier))
+    async def _sleep_before_another_try(try_num=0):
+        await asyncio.sleep(Retries.sleep * (try_num * Retries.sleep_multiplier))
 
     def _log_exc_final_failure(self, exc):
         logger.exception(f"{self.inst.get_relative_without_ext()} didn't update due err {type(exc)}")
         if Retries.trace_errors:
             logger.exception("Backtrace: ", exception=exc)
 
-    def sync_handle_exception(self, exc, _retries=0):
-        if _retries > Retries.max_:
-            self._log_exc_final_failure(exc)
-            return False
-        self._log_exc_final_failure(exc)
-        self._sleep_before_another_try(_retries)
-        return self.update(_retry=_retries+1)
-
     async def async_handle_exception(self, exc, _retries=0):
-        if _retries > Retries.max_:
+        # same text would blow the budget again and throttling host already got its retries
+        if _retries > Retries.max_ or isinstance(exc, (RegexBudgetExceeded, RateLimited)):
             self._log_exc_final_failure(exc)
-            return False
-        self._log_exc_final_failure(exc)
-        self._sleep_before_another_try(_retries)
+            return None
+        self._log_exc_type_on_try(exc, _retries)
+        await self._sleep_before_another_try(_retries)
         return await self.async_update(_retry=_retries+1)
 
-    def update(self, _retry=0):
-        try:
-            self.inst.makedirs()
-            domains = self.get_all_domains()
-            domains = tuple(filter(lambda url: url not in (False, "", None), domains))
+    def get_profile_group(self):
+        if self.inst.parent is None:
+            return self.inst.relative_filepath_without_ext
+        return self.inst.parent.relative_filepath_without_ext
+
+    def stage(self, name):
+        return PROFILER.stage(self.get_profile_group(), f"{self.inst.relative_filepath_without_ext}.{name}")
+
+    def async_stage(self, name):
+        return PROFILER.async_stage(self.get_profile_group(), f"{self.inst.relative_filepath_without_ext}.{name}")
+
+    async def postprocess(self, items) -> list[InstanceRecord]:
+        with self.stage("postprocess"):
+            records = self.to_records(items)
             if ESCAPE_DUPLICATES:
-                domains = self.check_duplicates(domains)
-            domains = list(sorted(domains))
+                records = self.check_duplicates(records)
+            records.sort(key=lambda x: x.domain)
             if self.inst.domains_handle is not None:
-                domains = self.inst.domains_handle(domains)
-            if self.inst.check_domain:
-                domains = list(filter(self.check_domain, domains))
-            if self.check_if_update(domains):
-                self.inst.save_as_json(domains)
-                self.inst.save_list_as_txt(domains)
-                return True
-            return False
-        except Exception as exc:
-            return self.sync_handle_exception(exc, _retries=_retry)
+                # handle works with plain domains, metadata doesn't survive it
+                records = self.to_records(self.inst.domains_handle([x.domain for x in records]))
+        if self.inst.check_domain:
+            async with self.async_stage("check"):
+                checks = await asyncio.gather(*(self.check_domain(x.domain) for x in records))
+            records = [record for record, ok in zip(records, checks) if ok]
+        return records
 
     async def async_update(self, _retry=0):
         try:
             self.inst.makedirs()
-            domains = await self.async_get_all_domains()
-            domains = tuple(filter(lambda url: url not in (False, "", None), domains))
-            if ESCAPE_DUPLICATES:
-                domains = self.check_duplicates(domains)
-            domains = list(sorted(domains))
-            if self.inst.domains_handle is not None:
-                domains = self.inst.domains_handle(domains)
-            if self.inst.check_domain:  # I even don't want to fix it... It's all to Piped... I love u, Piped
-                domains = list(filter(lambda x: self.check_domain(x), domains))
-            if self.check_if_update(domains):
-                self.inst.save_as_json(domains)
-                self.inst.save_list_as_txt(domains)
-                return True
-            return False
+            async with self.async_stage("fetch"):
+                data = await self.fetch()
+            # off the loop, so slow parse of one source doesn't stall fetches and deadlines of others
+            items = await asyncio.to_thread(self.parse_in_stage, data)
+            records = await self.postprocess(items)
+            with self.stage("save"):
+                domains = [x.domain for x in records]
+                if WRITE_META:
+                    self.inst.save_records_as_meta_json(records)
+                if self.check_if_update(domains):
+                    self.inst.save_as_json(domains)
+                    self.inst.save_list_as_txt(domains)
+                    return True
+                return False
         except Exception as exc:
             return await self.async_handle_exception(exc, _retries=_retry)
 
-    async def async_get_all_domains(self):
-        raise NotImplementedError
+    async def _update_in_session(self):
+        async with ENGINE:
+            return await self.async_update()
 
-    def get_all_domains(self):
+    def update(self):
+        return asyncio.run(self._update_in_session())
+
+    async def fetch(self):
         raise NotImplementedError
 
+    def parse(self, data):
+        return data
+
+    def parse_in_stage(self, data):
+        with self.stage("parse"):
+            return self.parse(data)
+
+    async def async_get_all_domains(self):
+        return self.parse(await self.fetch())
+
 
 @dataclass
 class RegexFromUrlInstance(BaseInstance):
@@ -241,8 +242,8 @@ class RegexFromUrlInstance(BaseInstance):
 
     def get_patterns_compiled(self):
         if isinstance(self.regex_pattern, str):
-            return (re.compile(self.regex_pattern, flags=re.MULTILINE), )
-        return tuple(map(lambda x: re.compile(x, flags=re.MULTILINE), self.regex_pattern))
+            return (compile_pattern(self.regex_pattern), )
+        return tuple(map(compile_pattern, self.regex_pattern))
 
 
 class RegexFromUrl(BaseDomainsProvider):
@@ -253,8 +254,8 @@ class RegexFromUrl(BaseDomainsProvider):
         super().__init__()
 
     @staticmethod
-    def _get_match_and_other_text(text, pattern, index_from=0):
-        match = pattern.search(text[index_from:])
+    def _get_match_and_other_text(text, pattern, index_from=0, budget=None):
+        match = (budget or Budget(0)).search(pattern, text[index_from:])
         if match is None:
             return False
         return match, index_from+match.end()+1
@@ -262,26 +263,26 @@ class RegexFromUrl(BaseDomainsProvider):
     def get_all_domains_from_text(self, text):
         domain_list = list()
         index_from = 0
+        # pathological page fails fast instead of hanging whole run
+        budget = Budget(name=self.inst.relative_filepath_without_ext)
         for pattern in self.inst.get_patterns_compiled():
-            for _ in range(len(pattern.findall(text))):
-                res = self._get_match_and_other_text(text, pattern, index_from)
+            for _ in range(len(budget.findall(pattern, text))):
+                res = self._get_match_and_other_text(text, pattern, index_from, budget)
                 if not res:
                     break
                 match, index_from = res
-                if (match_group := match.groupdict().get(self.inst.regex_group)) is not None:
-                    domain_list.append(match_group)
-        return domain_list
-
-    def get_all_domains(self):
-        text = self.inst.get().text
-        domain_list = self.get_all_domains_from_text(text)
+                groups = match.groupdict()
+                if (match_group := groups.pop(self.inst.regex_group, None)) is not None:
+                    # other named groups (country, notes, ...) are kept as metadata
+                    domain_list.append((match_group, {k: v.strip() for k, v in groups.items() if v is not None}))
         return domain_list
 
-    async def async_get_all_domains(self):
+    async def fetch(self):
         resp = await self.inst.a_get()
-        text = resp.text
-        domain_list = self.get_all_domains_from_text(text)
-        return domain_list
+        return resp.text
+
+    def parse(self, data):
+        return self.get_all_domains_from_text(data)
 
 
 @dataclass
@@ -324,15 +325,12 @@ class JustFromUrl(BaseDomainsProvider):
         self.inst = instance
         super().__init__()
 
-    def get_all_domains(self):
-        raw = self.inst.get().text
-        domain_list = raw.strip("\n").split("\n")
-        return domain_list
-
-    async def async_get_all_domains(self):
+    async def fetch(self):
         resp = await self.inst.a_get()
-        domain_list = resp.text.strip("\n").split("\n")
-        return domain_list
+        return resp.text
+
+    def parse(self, data):
+        return data.strip("\n").split("\n")
 
 
 @dataclass
@@ -351,24 +349,43 @@ class JSONUsingCallable(BaseDomainsProvider):
         self.inst = instance
         super().__init__()
 
-    def get_all_domains(self):
-        resp = self.inst.get()
-        raw = resp.json()
-        result = self.inst.json_handle(raw)
-        return result
+    async def fetch(self):
+        return await self.inst.a_get()
+
+    def parse(self, data):
+        return self.inst.json_handle(data.json())
+
+
+@dataclass
+class JSONByNetworkInstance(BaseInstance):
+    """All networks of group from one registry, json_handle gives URLs or domains of every network"""
+    url: URL
+    json_handle: Callable
+
+    def from_instance(self):
+        return JSONByNetwork(self)
+
+
+class JSONByNetwork(BaseDomainsProvider):
+    inst: JSONByNetworkInstance
+
+    def __init__(self, instance: JSONByNetworkInstance) -> None:
+        self.inst = instance
+        super().__init__()
+
+    async def get_buckets(self):
+        resp = await self.inst.a_get()
+        with self.stage("split"):
+            return split_by_network(self.inst.json_handle(resp.json()))
 
-    async def async_get_all_domains(self, _timeouts=0, _last_timeout=None):
-        if _timeouts > TIMEOUTS_MAX:
-            raise _last_timeout
-        async with httpx.AsyncClient(headers=HEADERS) as client:
-            try:
-                resp = await self.inst.a_get()
-            except httpx.ConnectTimeout as e:
-                time.sleep(SLEEP_TIMEOUT_PER_TIMEOUT)
-                return await self.async_get_all_domains(_timeouts=_timeouts+1, _last_timeout=e)
-            raw = resp.json()
-            result = self.inst.json_handle(raw)
-            return result
+    async def fetch(self):
+        if self.inst.parent is None:
+            return await self.get_buckets()
+        # sources of group split registry once and take their own network, handle is in key so they must share it
+        return await self.inst.parent.get_cached(("networks", self.inst.url, self.inst.json_handle), self.get_buckets)
+
+    def parse(self, data):
+        return data[self.inst.relative_filepath_without_ext]
 
 
 @dataclass
@@ -389,26 +406,11 @@ class GetDomainsFromHeaders(BaseDomainsProvider):
         self.inst = instance
         super().__init__()
 
-    def get_domain_from_header(self, domain):
-        _domain = None
-        try:
-            resp = httpx.get("https://" + domain, headers=HEADERS)
-            _domain = get_domain_from_url(resp.headers[self.inst.header])
-            if LOG_DOMAIN_FROM_HEADERS and _domain:
-                logger.info(f"-----\nDomain from header found:\nheader: {self.inst.header}\noriginal: {domain}\nfound: {_domain}\n-----")
-        except KeyError:
-            return None
-        except Exception as e:
-            logger.warning("Sth wrong with " + domain)
-            logger.warning("Error: " + str(type(e)))
-            logger.warning(f"{self.inst.header} from {domain} skipped")
-        return _domain
-
     async def async_get_domain_from_header(self, domain):
         _domain = None
         try:
-            async with httpx.AsyncClient(headers=HEADERS) as client:
-                resp = await client.get("https://" + domain)
+            # onion and i2p probes of group share one response per domain
+            resp = await self.inst.a_get("https://" + domain)
             _domain = get_domain_from_url(resp.headers[self.inst.header])
             if LOG_DOMAIN_FROM_HEADERS and _domain:
                 logger.info(f"-----\nDomain from header found:\nheader: {self.inst.header}\noriginal: {domain}\nfound: {_domain}\n-----")
@@ -420,19 +422,12 @@ class GetDomainsFromHeaders(BaseDomainsProvider):
             logger.warning(f"{self.inst.header} from {domain} skipped")
         return _domain
 
-    def get_all_domains(self):
+    async def fetch(self):
         main_domains = self.inst.main.load_from_json()
-        domains = list(filter(lambda x: x is not None, map(self.get_domain_from_header, main_domains)))
-        return tuple(domains)
+        return zip(await asyncio.gather(*map(self.async_get_domain_from_header, main_domains)), main_domains)
 
-    async def async_get_all_domains(self):
-        main_domains = self.inst.main.load_from_json()
-        domains = list()
-        for main in main_domains:
-            domain = await self.async_get_domain_from_header(main)
-            if domain:
-                domains.append(domain)
-        return tuple(domains)
+    def parse(self, data):
+        return tuple((domain, {"clearnet": main}) for domain, main in data if domain)
 
 
 @dataclass
@@ -440,8 +435,14 @@ class InstancesGroupData:
     name: str
     home_url: str
     relative_filepath_without_ext: str
-    instances: Iterable
+    instances: Union[Iterable, Callable[[], Iterable]]  # callable is called on first use, so metadata is cheap to load
     description: str = None
+    refresh_interval: int = None  # initial daemon interval in seconds, Refresh.default if None
+
+    def get_instances(self):
+        if callable(self.instances):
+            self.instances = tuple(self.instances())
+        return self.instances
 
     def get_desc(self):
         if self.description is None:
@@ -452,7 +453,8 @@ class InstancesGroupData:
         return self.name.lower()
 
     def from_instance(self):
-        return InstancesGroup(self, *self.instances)
+        # each group gets own copies, so readers building groups don't re-parent sources that are being refreshed
+        return InstancesGroup(self, *map(copy.copy, self.get_instances()))
 
     def get_relative_filepath(self):
         return os.path.join(INST_FOLDER, self.relative_filepath_without_ext)
@@ -473,35 +475,102 @@ class InstancesGroup:
             self.instances.append(inst)
         self.cached_enabled = cached_responses
         self.cached = dict()
+        self.waiters = dict()
 
     def update(self, priority=0):
-        for inst in self.instances:
-            if inst.priority != priority:
-                continue
-            inst.from_instance().update()
+        async def _update():
+            async with ENGINE:
+                return await asyncio.gather(*self.get_coroutines(priority=priority))
+        return asyncio.run(_update())
+
+    async def get_cached(self, key, factory):
+        if not self.cached_enabled:
+            return await factory()
+        if (task := self.cached.get(key)) is None:
+            task = self.cached[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda t: self._forget_failed(key, t))
+        # shared request is cancelled only when every source waiting for it is
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key] and not task.done():
+                task.cancel()
 
-    def cache_response(self, url, data):
-        if self.cached_enabled:
-            self.cached[url] = data
+    def _forget_failed(self, key, task):
+        # so retry does fetch again instead of getting same exception
+        if task.cancelled() or task.exception() is not None:
+            self.cached.pop(key, None)
 
-    def get_cached_response(self, url):
-        return self.cached.get(url)
+    def get_providers(self, priority=0):
+        return tuple([x.from_instance() for x in self.instances if x.priority == priority])
 
     def get_coroutines(self, priority=0):
-        return tuple([x.from_instance().async_update() for x in self.instances if x.priority == priority])
+        return tuple([x.async_update() for x in self.get_providers(priority=priority)])
+
+
+class RunReport:
+    """Runs sources under Deadlines and keeps what happened to each"""
 
+    def __init__(self, budget=None):
+        self.started = time.monotonic()
+        self.deadline = self.started + budget if budget else None
+        self.updated = list()
+        self.unchanged = list()
+        self.failed = list()
+        self.timed_out = list()
+
+    def get_timeout(self):
+        timeout = Deadlines.source or None
+        if self.deadline is not None:
+            left = max(self.deadline - time.monotonic(), 0)
+            timeout = left if timeout is None else min(timeout, left)
+        return timeout
+
+    async def run_source(self, provider: BaseDomainsProvider):
+        name = provider.inst.get_relative_without_ext()
+        try:
+            result = await asyncio.wait_for(provider.async_update(), self.get_timeout())
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} cut off by deadline, previous list is kept")
+            self.timed_out.append(name)
+            return None
+        {True: self.updated, False: self.unchanged, None: self.failed}[result].append(name)
+        return result
 
-def get_domain_from_url(url):
-    parsed = urlparse(url)
-    url_has_path = parsed.path not in ("", "/", None)
-    if not url_has_path:
-        return parsed.netloc
-    elif url_has_path and IGNORE_DOMAINS_WITH_PATHS:
+    def get_outcome(self):
+        """True if anything changed, False if all sources are unchanged, None if some failed and nothing changed"""
+        if self.updated:
+            return True
+        if self.failed or self.timed_out:
+            return None
         return False
-    if url_has_path and ENABLE_PATH_IN_DOMAINS:
-        return parsed.netloc + parsed.path
-    else:
-        return parsed.netloc
+
+    def log(self, title="Run"):
+        logger.info(f"{title} finished in {time.monotonic() - self.started:.0f}s: {len(self.updated)} updated, "
+                    f"{len(self.unchanged)} unchanged, {len(self.failed)} failed, {len(self.timed_out)} timed out")
+        for title, names in (("Failed", self.failed), ("Timed out", self.timed_out)):
+            if names:
+                logger.warning(f"{title}: " + ", ".join(names))
+
+
+def get_searx_meta(info):
+    return {"version": info.get("version"), "uptime": (info.get("uptime") or dict()).get("uptimeMonth")}
+
+
+def get_searx_instances(raw):
+    return [(url, get_searx_meta(info)) for url, info in raw["instances"].items()]
+
+
+def get_hyperpipe_instances(raw):
+    return tuple(map(lambda inst: re.match(r"https?\:\/\/([^\/\s]*)\/?", inst['url']).groups()[0], raw))
+
+
+def get_invidious_meta(info):
+    ratio = ((info.get("monitor") or dict()).get("30dRatio") or dict()).get("ratio")
+    return {"region": info.get("region"), "uptime": ratio,
+            "version": (((info.get("stats") or dict()).get("software") or dict()).get("version"))}
 
 
 def get_clearnet_base(path):
@@ -511,121 +580,121 @@ def get_clearnet_base(path):
 SHARED_URLS_FOR_CACHE = dict()
 INSTANCE_GROUPS = [
     InstancesGroupData(name="ProxiTok", home_url="https://github.com/pablouser1/ProxiTok", relative_filepath_without_ext="tiktok/proxitok",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="# Clearnet", crop_to=".onion", url="https://raw.githubusercontent.com/wiki/pablouser1/ProxiTok/Public-instances.md", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN}+)\)\s+(?:\(Official\)\s+)?\|"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="# Clearnet", crop_to=".onion", url="https://raw.githubusercontent.com/wiki/pablouser1/ProxiTok/Public-instances.md", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN}+)\)\s+(?:\(Official\)\s+)?\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, crop_from="# Tor", url="https://raw.githubusercontent.com/wiki/pablouser1/ProxiTok/Public-instances.md", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_ONION})\]\((?P<url>https?:\/\/{Regex.DOMAIN_ONION})\)\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, crop_from="# I2P", url="https://raw.githubusercontent.com/wiki/pablouser1/ProxiTok/Public-instances.md", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_I2P})\]\((?P<url>https?:\/\/{Regex.DOMAIN_I2P})\)\s+\|"))),
     InstancesGroupData(name="SimplyTranslateLegacy", home_url="https://codeberg.org/SimpleWeb/SimplyTranslate-Web", relative_filepath_without_ext="translate/simplytranslatelegacy",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/simplytranslatelegacy/instances.txt"),
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/simplytranslatelegacy/instances.txt"),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("translate/simplytranslatelegacy")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("translate/simplytranslatelegacy")))),
     InstancesGroupData(name="SimplyTranslate", home_url="https://codeberg.org/ManeraKai/simplytranslate", relative_filepath_without_ext="translate/simplytranslate",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/ManeraKai/simplytranslate/raw/branch/main/instances.json", json_handle=lambda raw: [get_domain_from_url(x['url']) for x in raw]),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/ManeraKai/simplytranslate/raw/branch/main/instances.json", json_handle=lambda raw: [get_domain_from_url(x['url']) for x in raw]),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("translate/simplytranslate")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("translate/simplytranslate")),)),
     InstancesGroupData(name="Mozhi", home_url="https://codeberg.org/aryak/mozhi#readme", relative_filepath_without_ext="translate/mozhi",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/aryak/mozhi/raw/branch/master/instances.json", json_handle=lambda raw: [get_domain_from_url(x.get('link')) for x in raw]),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/aryak/mozhi/raw/branch/master/instances.json", json_handle=lambda raw: [get_domain_from_url(x.get('link')) for x in raw]),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://codeberg.org/aryak/mozhi/raw/branch/master/instances.json", json_handle=lambda raw: [get_domain_from_url(x.get('onion')) for x in raw]),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://codeberg.org/aryak/mozhi/raw/branch/master/instances.json", json_handle=lambda raw: [get_domain_from_url(x.get('i2p')) for x in raw]),)),
     InstancesGroupData(name="LingvaTranslate", home_url="https://github.com/TheDavidDelta/lingva-translate#lingva-translate", relative_filepath_without_ext="translate/lingvatranslate",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="# Instances", crop_to="##", url="https://raw.githubusercontent.com/thedaviddelta/lingva-translate/main/README.md", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\(https:\/\/{Regex.DOMAIN}\)(?:\s+\(Official\))?\s+\|"), )),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="# Instances", crop_to="##", url="https://raw.githubusercontent.com/thedaviddelta/lingva-translate/main/README.md", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\(https:\/\/{Regex.DOMAIN}\)(?:\s+\(Official\))?\s+\|"), )),
     InstancesGroupData(name="Whoogle", home_url="https://github.com/benbusby/whoogle-search#readme", relative_filepath_without_ext="search/whoogle",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Public Instances", url="https://raw.githubusercontent.com/benbusby/whoogle-search/main/README.md", regex_pattern=fr"^\|\s+\[https?:\/\/(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN})\/?\)\s+\|"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Public Instances", url="https://raw.githubusercontent.com/benbusby/whoogle-search/main/README.md", regex_pattern=fr"^\|\s+\[https?:\/\/(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN})\/?\)\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, crop_from="## Public Instances", url="https://raw.githubusercontent.com/benbusby/whoogle-search/main/README.md", regex_pattern=fr"^\|?\s+\[https?:\/\/(?P<domain>{Regex.DOMAIN_ONION})\]\((?P<url>https?:\/\/{Regex.DOMAIN_ONION})\/?\)\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, crop_from="## Public Instances", url="https://raw.githubusercontent.com/benbusby/whoogle-search/main/README.md", regex_pattern=fr"^\|?\s+\[https?:\/\/(?P<domain>{Regex.DOMAIN_I2P})\]\((?P<url>https?:\/\/{Regex.DOMAIN_I2P})\/?\)\s+\|"))),
     InstancesGroupData(name="SearXNG", home_url="https://github.com/searxng/searxng#readme", relative_filepath_without_ext="search/searx",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://searx.space/data/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: not any((".onion" in url, ".i2p" in url)), raw["instances"].keys()))))),
-                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://searx.space/data/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: ".onion" in url, raw["instances"].keys()))))),
-                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://searx.space/data/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: ".i2p" in url, raw["instances"].keys()))))))),
+                       instances=lambda: (JSONByNetworkInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://searx.space/data/instances.json", json_handle=get_searx_instances),
+                                  JSONByNetworkInstance(relative_filepath_without_ext=Network.ONION, url="https://searx.space/data/instances.json", json_handle=get_searx_instances),
+                                  JSONByNetworkInstance(relative_filepath_without_ext=Network.I2P, url="https://searx.space/data/instances.json", json_handle=get_searx_instances))),
     InstancesGroupData(name="LibreX", home_url="https://github.com/hnhx/librex#readme", relative_filepath_without_ext="search/librex",
-                       instances=(RegexFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/hnhx/librex/main/README.md", regex_group="clearnet", regex_pattern=fr"\|\s*\[(?P<clearnet>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN}\/?)\)\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<onion>{Regex.DOMAIN_ONION})\/?\)))\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<i2p>{Regex.DOMAIN_I2P})\/?\)))+s*"),
+                       instances=lambda: (RegexFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/hnhx/librex/main/README.md", regex_group="clearnet", regex_pattern=fr"\|\s*\[(?P<clearnet>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN}\/?)\)\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<onion>{Regex.DOMAIN_ONION})\/?\)))\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<i2p>{Regex.DOMAIN_I2P})\/?\)))+s*"),
                                   RegexFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/hnhx/librex/main/README.md", regex_group="onion", regex_pattern=fr"\|\s*\[(?P<clearnet>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN}\/?)\)\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<onion>{Regex.DOMAIN_ONION})\/?\)))\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<i2p>{Regex.DOMAIN_I2P})\/?\)))+s*"),
                                   RegexFromUrlInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/hnhx/librex/main/README.md", regex_group="i2p", regex_pattern=fr"\|\s*\[(?P<clearnet>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN}\/?)\)\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<onion>{Regex.DOMAIN_ONION})\/?\)))\s*\|\s*(?:❌|(?:\[✅\]\((?:http:\/\/)?(?P<i2p>{Regex.DOMAIN_I2P})\/?\)))+s*"))),
     InstancesGroupData(name="teddit", home_url="https://codeberg.org/teddit/teddit", relative_filepath_without_ext="reddit/teddit",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Instances", crop_to="##", url="https://codeberg.org/teddit/teddit/raw/branch/main/README.md", regex_pattern=fr"^(?:\|\s+)?(?:\[(?:https:\/\/)?(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN})\))"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Instances", crop_to="##", url="https://codeberg.org/teddit/teddit/raw/branch/main/README.md", regex_pattern=fr"^(?:\|\s+)?(?:\[(?:https:\/\/)?(?P<domain>{Regex.DOMAIN})\]\((?P<url>https?:\/\/{Regex.DOMAIN})\))"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, crop_from="## Instances", crop_to="##",  url="https://codeberg.org/teddit/teddit/raw/branch/main/README.md", regex_group="onion", regex_pattern=fr"\(http:\/\/(?P<onion>{Regex.DOMAIN_ONION})\/?\)"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, crop_from="## Instances", crop_to="##",  url="https://codeberg.org/teddit/teddit/raw/branch/main/README.md", regex_group="i2p", regex_pattern=fr"\(http:\/\/(?P<i2p>{Regex.DOMAIN_I2P})\/?\)"))),
     InstancesGroupData(name="libreddit", home_url="https://github.com/libreddit/libreddit#readme", relative_filepath_without_ext="reddit/libreddit",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/libreddit/libreddit-instances/master/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: url is not None, [x.get("url") for x in raw["instances"]]))))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/libreddit/libreddit-instances/master/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: url is not None, [x.get("url") for x in raw["instances"]]))))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/libreddit/libreddit-instances/master/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, tuple(filter(lambda url: url is not None, [x.get("onion") for x in raw["instances"]]))))))),
     InstancesGroupData(name="redlib", home_url="https://github.com/redlib-org/redlib#readme", relative_filepath_without_ext="reddit/redlib",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/redlib-org/redlib-instances/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x["url"] for x in raw["instances"] if "url" in x]))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/redlib-org/redlib-instances/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x["url"] for x in raw["instances"] if "url" in x]))),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("reddit/redlib")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("reddit/redlib")))),
     InstancesGroupData(name="WikiLess", home_url="https://gitea.slowb.ro/ticoombs/Wikiless#wikiless", relative_filepath_without_ext="wikipedia/wikiless",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/wikiless/clearnet.txt"),
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/wikiless/clearnet.txt"),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("wikipedia/wikiless")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("wikipedia/wikiless")),)),
     InstancesGroupData(name="Piped", home_url="https://github.com/TeamPiped/Piped#readme", relative_filepath_without_ext="youtube/piped",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/piped/clearnet.txt"),
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/piped/clearnet.txt"),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("youtube/piped")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("youtube/piped")))),
     InstancesGroupData(name="Invidious", home_url="https://github.com/iv-org/invidious#readme", relative_filepath_without_ext="youtube/invidious",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple(map(lambda inst: inst[0], tuple(filter(lambda inst: inst[1]["type"] == "https", raw))))),
-                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple(map(lambda inst: inst[0], tuple(filter(lambda inst: inst[1]["type"] == "onion", raw))))),
-                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple(map(lambda inst: inst[0], tuple(filter(lambda inst: inst[1]["type"] == "i2p", raw))))))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple((inst[0], get_invidious_meta(inst[1])) for inst in raw if inst[1]["type"] == "https")),
+                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple((inst[0], get_invidious_meta(inst[1])) for inst in raw if inst[1]["type"] == "onion")),
+                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://api.invidious.io/instances.json", json_handle=lambda raw: tuple((inst[0], get_invidious_meta(inst[1])) for inst in raw if inst[1]["type"] == "i2p")))),
     InstancesGroupData(name="Hyperpipe", home_url="https://codeberg.org/Hyperpipe/Hyperpipe#hyperpipe", relative_filepath_without_ext="youtube/hyperpipe",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.codeberg.page/Hyperpipe/pages/api/frontend.json", json_handle=lambda raw: tuple(filter(lambda url: not any((".onion" in url, ".i2p" in url)), tuple(map(lambda inst: re.match(r"https?\:\/\/([^\/\s]*)\/?", inst['url']).groups()[0], raw))))),
-                                  JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.codeberg.page/Hyperpipe/pages/api/frontend.json", json_handle=lambda raw: tuple(filter(lambda url: ".onion" in url, tuple(map(lambda inst: re.match(r"https?\:\/\/([^\/\s]*)\/?", inst['url']).groups()[0], raw))))))),
+                       instances=lambda: (JSONByNetworkInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.codeberg.page/Hyperpipe/pages/api/frontend.json", json_handle=get_hyperpipe_instances),
+                                  JSONByNetworkInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.codeberg.page/Hyperpipe/pages/api/frontend.json", json_handle=get_hyperpipe_instances))),
     InstancesGroupData(name="Scribe", home_url="https://sr.ht/~edwardloveall/Scribe/", relative_filepath_without_ext="medium/scribe",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, regex_group="domain", url="https://git.sr.ht/~edwardloveall/scribe/blob/HEAD/docs/instances.md", crop_from="# Instances", crop_to="## ", regex_pattern=fr"[\<\(]https?:\/\/(?:(?P<onion>{Regex.DOMAIN_ONION})|(?P<i2p>{Regex.DOMAIN_I2P})|(?P<domain>{Regex.DOMAIN}))[\>\)]"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, regex_group="domain", url="https://git.sr.ht/~edwardloveall/scribe/blob/HEAD/docs/instances.md", crop_from="# Instances", crop_to="## ", regex_pattern=fr"[\<\(]https?:\/\/(?:(?P<onion>{Regex.DOMAIN_ONION})|(?P<i2p>{Regex.DOMAIN_I2P})|(?P<domain>{Regex.DOMAIN}))[\>\)]"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, regex_group="onion", url="https://git.sr.ht/~edwardloveall/scribe/blob/HEAD/docs/instances.md", crop_from="# Instances", crop_to="## ", regex_pattern=fr"[\<\(]https?:\/\/(?:(?P<onion>{Regex.DOMAIN_ONION})|(?P<i2p>{Regex.DOMAIN_I2P})|(?P<domain>{Regex.DOMAIN}))[\>\)]"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, regex_group="i2p", url="https://git.sr.ht/~edwardloveall/scribe/blob/HEAD/docs/instances.md", crop_from="# Instances", crop_to="## ", regex_pattern=fr"[\<\(]https?:\/\/(?:(?P<onion>{Regex.DOMAIN_ONION})|(?P<i2p>{Regex.DOMAIN_I2P})|(?P<domain>{Regex.DOMAIN}))[\>\)]"))),
     InstancesGroupData(name="Quetre", home_url="https://github.com/zyachel/quetre#readme", relative_filepath_without_ext="quora/quetre",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/zyachel/quetre/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x['clearnet'] for x in raw if 'clearnet' in x]))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/zyachel/quetre/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x['clearnet'] for x in raw if 'clearnet' in x]))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/zyachel/quetre/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x['tor'] for x in raw if 'tor' in x]))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/zyachel/quetre/main/instances.json", json_handle=lambda raw: tuple(map(get_domain_from_url, [x['i2p'] for x in raw if 'i2p' in x]))))),
     InstancesGroupData(name="rimgo", home_url="https://codeberg.org/video-prize-ranch/rimgo#rimgo", relative_filepath_without_ext="imgur/rimgo",
-                       instances=(RegexFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/rimgo/instances/raw/branch/main/README.md", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN}+)\]\((?P<url>https?:\/\/{Regex.DOMAIN})\)+(?:\s+\(official\))?\s+\|\s+(?P<flagemoji>\W+)\s+(?P<country>\w+)\s+\|\s+(?P<provider>(?:[^\|])+)\s*\|\s+(?P<data>(?:[^\|])+)\s+\|(?P<notes>(?:[^\|])+)\|"),
+                       instances=lambda: (RegexFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/rimgo/instances/raw/branch/main/README.md", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN}+)\]\((?P<url>https?:\/\/{Regex.DOMAIN})\)+(?:\s+\(official\))?\s+\|\s+(?P<flagemoji>\W+)\s+(?P<country>\w+)\s+\|\s+(?P<provider>(?:[^\|])+)\s*\|\s+(?P<data>(?:[^\|])+)\s+\|(?P<notes>(?:[^\|])+)\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://codeberg.org/rimgo/instances/raw/branch/main/README.md", crop_from="### Tor", crop_to="###", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_ONION})\]\((?P<url>https?:\/\/{Regex.DOMAIN_ONION})\)+(?:\s+\(official\))?\s+\|\s+(?P<data>(?:[^\|])+)\s+\|(?P<notes>(?:[^\|])+)\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, url="https://codeberg.org/rimgo/instances/raw/branch/main/README.md", crop_from="### I2P", crop_to="##", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_I2P})\]\((?P<url>https?:\/\/{Regex.DOMAIN_I2P})\)+(?:\s+\(official\))?\s+\|\s+(?P<data>(?:[^\|])+)\s+\|(?P<notes>(?:[^\|])+)\|"))),
-    InstancesGroupData(name="librarian (discontinued)", home_url="https://codeberg.org/librarian/librarian#librarian", relative_filepath_without_ext="odysee/librarian",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/librarian/clearnet.txt"),
+    InstancesGroupData(name="librarian (discontinued)", home_url="https://codeberg.org/librarian/librarian#librarian", relative_filepath_without_ext="odysee/librarian", refresh_interval=Refresh.max_,
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/librarian/clearnet.txt"),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("odysee/librarian")))),
     InstancesGroupData(name="nitter", home_url="https://github.com/zedeus/nitter#readme", relative_filepath_without_ext="twitter/nitter",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/wiki/zedeus/nitter/Instances.md", crop_to="### Tor", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN})\)"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/wiki/zedeus/nitter/Instances.md", crop_to="### Tor", regex_pattern=fr"^\|\s+\[(?P<domain>{Regex.DOMAIN})\]\((?P<clearurl>https?:\/\/{Regex.DOMAIN})\)"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/wiki/zedeus/nitter/Instances.md", crop_from="### Tor", crop_to=".i2p", regex_pattern=fr"^\|\s+\<http\:\/\/(?P<domain>{Regex.DOMAIN_ONION})\/?\>", regex_group="domain"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, crop_from="### I2P", crop_to="### Lokinet", regex_pattern=fr"^-\s+\<http\:\/\/(?P<domain>{Regex.DOMAIN_I2P})\/?\>", url="https://raw.githubusercontent.com/wiki/zedeus/nitter/Instances.md", regex_group="domain"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.LOKI, crop_from="### Lokinet", regex_pattern=fr"^-\s+\<http\:\/\/(?P<domain>{Regex.DOMAIN_LOKI})\/?\>", url="https://raw.githubusercontent.com/wiki/zedeus/nitter/Instances.md", regex_group="domain"))),
     InstancesGroupData(name="send", home_url="https://github.com/timvisee/send#readme", relative_filepath_without_ext="filedrop/send",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Instances", crop_to="##", url="https://raw.githubusercontent.com/timvisee/send-instances/master/README.md", regex_pattern=fr"https:\/\/(?P<domain>{Regex.DOMAIN})\s+\|"), )),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="## Instances", crop_to="##", url="https://raw.githubusercontent.com/timvisee/send-instances/master/README.md", regex_pattern=fr"https:\/\/(?P<domain>{Regex.DOMAIN})\s+\|"), )),
     InstancesGroupData(name="BreezeWiki", home_url="https://gitdab.com/cadence/breezewiki", relative_filepath_without_ext="fandom/breezewiki",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://docs.breezewiki.com/files/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst['instance']), raw))), )),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://docs.breezewiki.com/files/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst['instance']), raw))), )),
     InstancesGroupData(name="libmedium", home_url="https://git.batsense.net/realaravinth/libmedium", relative_filepath_without_ext="medium/libmedium",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://git.batsense.net/realaravinth/libmedium/raw/branch/master/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+https:\/\/(?P<domain>{Regex.DOMAIN})\/?\s+\|"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://git.batsense.net/realaravinth/libmedium/raw/branch/master/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+https:\/\/(?P<domain>{Regex.DOMAIN})\/?\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://git.batsense.net/realaravinth/libmedium/raw/branch/master/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+http:\/\/(?P<domain>{Regex.DOMAIN_ONION})\/?\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, url="https://git.batsense.net/realaravinth/libmedium/raw/branch/master/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+http:\/\/(?P<domain>{Regex.DOMAIN_I2P})\/?\s+\|"))),
     InstancesGroupData(name="dumb", home_url="https://github.com/rramiachraf/dumb", relative_filepath_without_ext="genius/dumb",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/rramiachraf/dumb/main/README.md", crop_from="## Public Instances", crop_to="##", regex_pattern=fr"^\|\s+\<https:\/\/(?P<domain>{Regex.DOMAIN})\>"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/rramiachraf/dumb/main/README.md", crop_from="## Public Instances", crop_to="##", regex_pattern=fr"^\|\s+\<https:\/\/(?P<domain>{Regex.DOMAIN})\>"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/rramiachraf/dumb/main/README.md", crop_from="### Tor", crop_to="##", regex_pattern=fr"^\|\s+\<http:\/\/(?P<domain>{Regex.DOMAIN_ONION})\>"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/rramiachraf/dumb/main/README.md", crop_from="### I2P", crop_to="##", regex_pattern=fr"^\|\s+\<http:\/\/(?P<domain>{Regex.DOMAIN_I2P})\>"))),
     InstancesGroupData(name="BiblioReads", home_url="https://github.com/nesaku/BiblioReads", relative_filepath_without_ext="goodreads/biblioreads",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/nesaku/BiblioReads/main/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN})\]\(https:\/\/{Regex.DOMAIN}\)\s+\|"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/nesaku/BiblioReads/main/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN})\]\(https:\/\/{Regex.DOMAIN}\)\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/nesaku/BiblioReads/main/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_ONION})\]\(https:\/\/{Regex.DOMAIN_ONION}\)\s+\|"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/nesaku/BiblioReads/main/README.md", crop_from="## Instances", crop_to="##", regex_pattern=fr"\|\s+\[(?P<domain>{Regex.DOMAIN_I2P})\]\(http:\/\/{Regex.DOMAIN_I2P}\)\s+\|"))),
     InstancesGroupData(name="GotHub", home_url="https://codeberg.org/gothub/gothub", relative_filepath_without_ext="github/gothub",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/gothub/gothub-instances/raw/branch/master/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst['link']), raw))), )),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://codeberg.org/gothub/gothub-instances/raw/branch/master/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst['link']), raw))), )),
     InstancesGroupData(name="RYD-Proxy", home_url="https://github.com/TeamPiped/RYD-Proxy", relative_filepath_without_ext="ryd/rydproxy",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/ryd/clearnet.txt"), )),
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/ryd/clearnet.txt"), )),
     InstancesGroupData(name="libremdb", home_url="https://github.com/zyachel/libremdb", relative_filepath_without_ext="imdb/libremdb",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/zyachel/libremdb/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst.get("clearnet")), raw))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/zyachel/libremdb/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst.get("clearnet")), raw))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/zyachel/libremdb/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst.get("tor")), raw))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/zyachel/libremdb/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst.get("i2p")), raw))))),
     InstancesGroupData(name="AnonymousOverflow", home_url="https://github.com/httpjamesm/AnonymousOverflow#readme", relative_filepath_without_ext="stackoverflow/anonymousoverflow",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/httpjamesm/AnonymousOverflow/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst["url"]), raw['clearnet']))),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/httpjamesm/AnonymousOverflow/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst["url"]), raw['clearnet']))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.ONION, url="https://raw.githubusercontent.com/httpjamesm/AnonymousOverflow/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst["url"]), raw['onion']))),
                                   JSONUsingCallableInstance(relative_filepath_without_ext=Network.I2P, url="https://raw.githubusercontent.com/httpjamesm/AnonymousOverflow/main/instances.json", json_handle=lambda raw: tuple(map(lambda inst: get_domain_from_url(inst["url"]), raw['i2p']))))),
     InstancesGroupData(name="PrivateBin", home_url="https://privatebin.info/", relative_filepath_without_ext="tools/privatebin",
-                       instances=(RegexCroppedFromUrlInstance(crop_from=r"<h2>Welcome!</h2>", crop_to=r"github-fork-ribbon", relative_filepath_without_ext=Network.CLEARNET, url="https://privatebin.info/directory/", domains_handle=lambda x: tuple(map(lambda dom: get_domain_from_url(dom.replace("&#x2F;&#x2F;", "//").replace("&", "")), x)), regex_pattern=r'<a href="(?P<url>https:(?:(?:\/\/)|&#x2F;&#x2F;)\S+)">', regex_group="url"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(crop_from=r"<h2>Welcome!</h2>", crop_to=r"github-fork-ribbon", relative_filepath_without_ext=Network.CLEARNET, url="https://privatebin.info/directory/", domains_handle=lambda x: tuple(map(lambda dom: get_domain_from_url(dom.replace("&#x2F;&#x2F;", "//").replace("&", "")), x)), regex_pattern=r'<a href="(?P<url>https:(?:(?:\/\/)|&#x2F;&#x2F;)\S+)">', regex_group="url"),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.ONION, header=MirrorHeaders.ONION, main=get_clearnet_base("tools/privatebin")),
                                   GetDomainsFromHeadersInstance(relative_filepath_without_ext=Network.I2P, header=MirrorHeaders.I2P, main=get_clearnet_base("tools/privatebin")))),
     InstancesGroupData(name="CloudTube", home_url="https://sr.ht/~cadence/tube/", relative_filepath_without_ext="youtube/cloudtube",
-                       instances=(JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/cloudtube/clearnet.txt"), )),
+                       instances=lambda: (JustFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://raw.githubusercontent.com/NoPlagiarism/frontend-instances-custom/master/cloudtube/clearnet.txt"), )),
     InstancesGroupData(name="4get", home_url="https://git.lolcat.ca/lolcat/4get", relative_filepath_without_ext="search/4get",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://4get.ca/ami4get", json_handle=lambda raw: [get_domain_from_url(x.lower()) for x in raw['instances']]),)),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://4get.ca/ami4get", json_handle=lambda raw: [get_domain_from_url(x.lower()) for x in raw['instances']]),)),
     InstancesGroupData(name="piped-proxy", home_url="https://github.com/TeamPiped/piped-proxy", relative_filepath_without_ext="youtube/piped-proxy",
-                       instances=(JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://piped-instances.kavin.rocks/", json_handle=lambda raw: [get_domain_from_url(x["image_proxy_url"]) for x in raw]), )),
+                       instances=lambda: (JSONUsingCallableInstance(relative_filepath_without_ext=Network.CLEARNET, url="https://piped-instances.kavin.rocks/", json_handle=lambda raw: [get_domain_from_url(x["image_proxy_url"]) for x in raw]), )),
     InstancesGroupData(name="SafeTwitch", home_url="https://codeberg.org/SafeTwitch/safetwitch#readme", relative_filepath_without_ext="twitch/safetwitch",
-                       instances=(RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="### Clearnet", crop_to="###", url="https://codeberg.org/SafeTwitch/safetwitch/raw/branch/master/README.md", regex_pattern=f"^\|\s+\[[^\]]+\]\(https?:\/\/(?P<domain>{Regex.DOMAIN})\/?\)"),
+                       instances=lambda: (RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.CLEARNET, crop_from="### Clearnet", crop_to="###", url="https://codeberg.org/SafeTwitch/safetwitch/raw/branch/master/README.md", regex_pattern=f"^\|\s+\[[^\]]+\]\(https?:\/\/(?P<domain>{Regex.DOMAIN})\/?\)"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.ONION, crop_from="### Onion", crop_to="###", url="https://codeberg.org/SafeTwitch/safetwitch/raw/branch/master/README.md", regex_pattern=f"^\|\s+\[[^\]]+\]\(https?:\/\/(?P<domain>{Regex.DOMAIN_ONION})\/?\)"),
                                   RegexCroppedFromUrlInstance(relative_filepath_without_ext=Network.I2P, crop_from="### I2P", url="https://codeberg.org/SafeTwitch/safetwitch/raw/branch/master/README.md", regex_pattern=f"^\|\s+\[[^\]]+\]\(https?:\/\/(?P<domain>{Regex.DOMAIN_I2P})\/?\)"),)),
 ]
@@ -640,6 +709,14 @@ if EXCLUDE_GROUPS is not None:
     logger.info("FIL_GROUPS_EXCLUDE's active: " + str(EXCLUDE_GROUPS))
 
 
+def get_instance_group(name):
+    name = name.lower()
+    for group in INSTANCE_GROUPS:
+        if group.get_name() == name:
+            return group
+    raise KeyError(name)
+
+
 def should_skip_instance_group(inst: InstancesGroupData):
     if isinstance(GROUPS_ONLY, tuple):
         return inst.name.lower() not in GROUPS_ONLY
@@ -647,29 +724,44 @@ def should_skip_instance_group(inst: InstancesGroupData):
         return inst.name.lower() in EXCLUDE_GROUPS
 
 
-@logger.catch(reraise=True)
 def main():
-    for p in PRIORITIES:
-        for instance in INSTANCE_GROUPS:
-            if should_skip_instance_group(instance):
-                continue
-            instance.from_instance().update(priority=p)
-            time.sleep(SLEEP_TIMEOUT_PER_GROUP)
+    asyncio.run(async_main(concurrent=False))
 
 
 @logger.catch(reraise=True)
-async def async_main():
-    for p in PRIORITIES:
-        tasks = list()
-        for instance in INSTANCE_GROUPS:
-            if should_skip_instance_group(instance):
+async def async_main(concurrent=True):
+    report = RunReport(budget=Deadlines.run)
+    async with ENGINE, PROFILER.watch_loop():
+        for p in PRIORITIES:
+            providers = list()
+            for instance in INSTANCE_GROUPS:
+                if should_skip_instance_group(instance):
+                    continue
+                providers.extend(instance.from_instance().get_providers(priority=p))
+            if concurrent:
+                await asyncio.gather(*map(report.run_source, providers))
                 continue
-            tasks.extend(instance.from_instance().get_coroutines(priority=p))
-        await asyncio.gather(*tasks)
+            for provider in providers:
+                await report.run_source(provider)
+    report.log()
+    PROFILER.dump("scrape")
+    return report
 
 
 def run():
-    if ENABLE_ASYNC:
+    if ENABLE_DAEMON:
+        try:
+            from .daemon import run as daemon_run
+        except ImportError:
+            from daemon import run as daemon_run
+        daemon_run()
+    elif Server.enabled:
+        try:
+            from .server import run as server_run
+        except ImportError:
+            from server import run as server_run
+        server_run()
+    elif ENABLE_ASYNC:
         asyncio.run(async_main())
     else:
         main()
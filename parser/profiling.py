@@ -0,0 +1,167 @@
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+
+from loguru import logger
+
+try:
+    from .consts import HOME_PATH, Profile
+except ImportError:
+    from consts import HOME_PATH, Profile
+
+# profiler's own allocations aren't interesting
+SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+class GroupProfile:
+    def __init__(self):
+        self.stats = None
+        self.stages = dict()  # stage: {"calls", "seconds", "memory_peak", "memory_top"}
+
+    def add_stage(self, stage, seconds, profile=None, memory_peak=None, memory_top=None):
+        info = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0})
+        info["calls"] += 1
+        info["seconds"] += seconds
+        if memory_peak is not None:
+            info["memory_peak"] = max(info.get("memory_peak", 0), memory_peak)
+            info["memory_top"] = memory_top
+        if profile is not None:
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+
+
+class Profiler:
+    """FIL_PROFILE: cProfile for sync stages, wall time for awaited ones, loop lag for whole run.
+    FIL_PROFILE_MEMORY adds tracemalloc peak and top allocations to sync stages.
+    Dumped to Profile.folder/<run> as <group path>.prof (snakeviz, flameprof, etc.) and <group path>.json,
+    run keeps scrape and generate profiles of one group apart"""
+
+    def __init__(self, enabled=Profile.enabled, folder=os.path.join(HOME_PATH, Profile.folder), memory=Profile.memory):
+        self.enabled = enabled
+        self.memory = memory
+        self.folder = folder
+        self.groups = dict()
+        self.loop_lag = list()
+        self.overhead = 0.0  # seconds of profiler's own work, not counted as loop lag
+        self._profiling = threading.Lock()  # one cProfile at a time, parse stages run in threads
+
+    def get_group(self, group):
+        if (profile := self.groups.get(group)) is None:
+            profile = self.groups[group] = GroupProfile()
+        return profile
+
+    def stage(self, group, stage):
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(group, stage)
+
+    def _take_snapshot(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(Profile.memory_frames)
+        tracemalloc.reset_peak()
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def _get_memory_info(self, before):
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        return {"memory_peak": peak, "memory_top": [str(x) for x in after.compare_to(before, "lineno")[:Profile.memory_top]]}
+
+    @contextmanager
+    def _stage(self, group, stage):
+        # nested stages and ones overlapping a profiled one in another thread are timed only
+        if not self._profiling.acquire(blocking=False):
+            started = time.perf_counter()
+            yield
+            self.get_group(group).add_stage(stage, time.perf_counter() - started)
+            return
+        overhead_started = time.perf_counter()
+        before = self._take_snapshot() if self.memory else None
+        profile = cProfile.Profile()
+        self.overhead += time.perf_counter() - overhead_started
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - started
+            overhead_started = time.perf_counter()
+            memory = self._get_memory_info(before) if before is not None else dict()
+            self._profiling.release()
+            self.get_group(group).add_stage(stage, seconds, profile, **memory)
+            self.overhead += time.perf_counter() - overhead_started
+
+    def async_stage(self, group, stage):
+        if not self.enabled:
+            return nullcontext()
+        return self._async_stage(group, stage)
+
+    @asynccontextmanager
+    async def _async_stage(self, group, stage):
+        # other tasks run during await, so only wall time means anything here
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.get_group(group).add_stage(stage, time.perf_counter() - started)
+
+    async def sample_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + Profile.lag_interval
+            overhead = self.overhead
+            await asyncio.sleep(Profile.lag_interval)
+            self.loop_lag.append(max(loop.time() - expected - (self.overhead - overhead), 0.0))
+
+    @asynccontextmanager
+    async def watch_loop(self):
+        if not self.enabled:
+            yield
+            return
+        task = asyncio.ensure_future(self.sample_loop_lag())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    def get_loop_lag_summary(self):
+        lag = sorted(self.loop_lag)
+        if not lag:
+            return dict()
+        return {"samples": len(lag), "interval": Profile.lag_interval, "mean": sum(lag) / len(lag),
+                "p50": lag[len(lag) // 2], "p99": lag[int(len(lag) * 0.99)], "max": lag[-1]}
+
+    def dump(self, run, groups=None):
+        """Writes and forgets collected profiles, of given groups only if groups isn't None"""
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        folder = os.path.join(self.folder, run)
+        groups = tuple(self.groups) if groups is None else [x for x in groups if x in self.groups]
+        for group in groups:
+            profile = self.groups.pop(group)
+            filepath = os.path.join(folder, group)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            if profile.stats is not None:
+                profile.stats.dump_stats(filepath + ".prof")
+            with open(filepath + ".json", mode="w+", encoding="utf-8") as f:
+                json.dump(profile.stages, f, indent=4)
+        if lag := self.get_loop_lag_summary():
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, "loop_lag.json"), mode="w+", encoding="utf-8") as f:
+                json.dump(lag, f, indent=4)
+            logger.info(f"Event loop lag: p99 {lag['p99'] * 1000:.1f}ms, max {lag['max'] * 1000:.1f}ms")
+        # lag is since previous dump, so next run in same process starts clean
+        self.loop_lag = list()
+        self.overhead += time.perf_counter() - started
+        logger.info(f"Profiles of {len(groups)} groups saved to {folder}")
+
+PROFILER = Profiler()
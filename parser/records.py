@@ -0,0 +1,36 @@
+import sys
+
+
+class InstanceRecord:
+    """One instance of a source; slots and interned domains keep big registries cheap"""
+    __slots__ = ("domain", "network", "source", "meta")
+
+    def __init__(self, domain: str, network: str, source: str = None, meta: dict = None):
+        self.domain = sys.intern(domain)
+        self.network = network
+        self.source = source
+        if meta:
+            meta = {k: v for k, v in meta.items() if v not in (None, "")}
+        self.meta = meta or None
+
+    def __repr__(self):
+        return f"InstanceRecord({self.domain!r}, {self.network!r})"
+
+    def to_json(self):
+        obj = {"domain": self.domain, "network": self.network}
+        if self.source is not None:
+            obj["source"] = self.source
+        if self.meta:
+            obj["meta"] = self.meta
+        return obj
+
+
+def to_records(items, network, source=None):
+    """Domains or (domain, meta) pairs to records, empty domains are dropped"""
+    records = list()
+    for item in items:
+        domain, meta = item if isinstance(item, tuple) else (item, None)
+        if domain in (False, "", None):
+            continue
+        records.append(InstanceRecord(domain, network, source, meta))
+    return records
@@ -0,0 +1,245 @@
+import math
+import re
+import time
+
+from loguru import logger
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+try:
+    from .consts import RegexSafety
+except ImportError:
+    from consts import RegexSafety
+
+REPEATS = ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+# chars tried for character classes
+SAMPLE_CHARS = "a0 .-_|/:[](){}<>!#\n\t"
+
+_engine = None
+
+
+class RegexBudgetExceeded(TimeoutError):
+    pass
+
+
+def get_engine():
+    """regex if installed, it can stop matching on timeout unlike re. Imported on first use, it's slow to import"""
+    global _engine
+    if _engine is None:
+        try:
+            import regex as _engine
+        except ImportError:
+            logger.warning("regex isn't installed, regex budget is disabled")
+            _engine = re
+    return _engine
+
+
+def supports_timeout():
+    return get_engine() is not re
+
+
+def compile_pattern(pattern):
+    engine = get_engine()
+    return engine.compile(pattern, flags=engine.MULTILINE)
+
+
+class Budget:
+    """Time left for all regex work of one source"""
+
+    def __init__(self, seconds=RegexSafety.budget, name=""):
+        self.name = name
+        self.deadline = time.monotonic() + seconds if seconds and supports_timeout() else None
+
+    def get_timeout(self):
+        if self.deadline is None:
+            return dict()
+        if (left := self.deadline - time.monotonic()) <= 0:
+            raise RegexBudgetExceeded(f"{self.name} regex budget is spent")
+        # concurrent releases GIL while matching, parse runs in thread next to event loop
+        return {"timeout": left, "concurrent": True}
+
+    def search(self, pattern, text, pos=0):
+        try:
+            return pattern.search(text, pos, **self.get_timeout())
+        except TimeoutError as e:
+            raise RegexBudgetExceeded(f"{self.name} regex budget is spent on {pattern.pattern!r}") from e
+
+    def findall(self, pattern, text):
+        try:
+            return pattern.findall(text, **self.get_timeout())
+        except TimeoutError as e:
+            raise RegexBudgetExceeded(f"{self.name} regex budget is spent on {pattern.pattern!r}") from e
+
+
+# --- analyzer, used by tests/regex_compile.py ---
+
+def _class_accepts(char, items):
+    negate = False
+    accepted = False
+    for op, av in items:
+        op = str(op)
+        if op == "NEGATE":
+            negate = True
+        elif op == "LITERAL":
+            accepted |= char == chr(av)
+        elif op == "RANGE":
+            accepted |= av[0] <= ord(char) <= av[1]
+        elif op == "CATEGORY":
+            category = str(av).replace("CATEGORY_", "")
+            check = {"DIGIT": str.isdigit, "SPACE": str.isspace, "WORD": lambda x: x.isalnum() or x == "_"}
+            name = category.replace("NOT_", "")
+            if name in check:
+                accepted |= check[name](char) != category.startswith("NOT_")
+    return accepted != negate
+
+
+def get_chars(op, av):
+    """Chars one-char item accepts, in SAMPLE_CHARS order; None if item isn't one char"""
+    if op == "LITERAL":
+        return chr(av)
+    if op == "NOT_LITERAL":
+        return SAMPLE_CHARS.replace(chr(av), "")
+    if op == "ANY":
+        return SAMPLE_CHARS.replace("\n", "")
+    if op == "IN":
+        literals = "".join(chr(x) for o, x in av if str(o) == "LITERAL" and chr(x) not in SAMPLE_CHARS)
+        return "".join(x for x in SAMPLE_CHARS + literals if _class_accepts(x, av))
+    return None
+
+
+def get_first_chars(items):
+    """Chars text matching items can start with, as far as analyzer can tell"""
+    chars = ""
+    for op, av in items:
+        op = str(op)
+        if (one := get_chars(op, av)) is not None:
+            return chars + one
+        if op in REPEATS:
+            chars += get_first_chars(av[2])
+            if av[0] > 0:
+                return chars
+        elif op == "SUBPATTERN":
+            return chars + get_first_chars(av[-1])
+        elif op == "ATOMIC_GROUP":
+            return chars + get_first_chars(av)
+        elif op == "BRANCH":
+            return chars + "".join(get_first_chars(x) for x in av[1])
+        # anchors and lookarounds don't take chars, next item decides
+    return chars
+
+
+def generate(items):
+    """Shortest-ish string matching parsed pattern, good enough as prefix"""
+    result = ""
+    for op, av in items:
+        op = str(op)
+        if (one := get_chars(op, av)) is not None:
+            result += one[:1]
+        elif op == "BRANCH":
+            result += generate(av[1][0])
+        elif op == "SUBPATTERN":
+            result += generate(av[-1])
+        elif op == "ATOMIC_GROUP":
+            result += generate(av)
+        elif op in REPEATS:
+            result += generate(av[2]) * av[0]
+    return result
+
+
+def get_pumps(body, following):
+    """Texts repeat over body can be pumped with. Beside plain one, chars body shares with what follows it,
+    alone and alternated with other chars of body: "0." against [\\w.]+\\.[a-z]+ makes every dot a possible
+    end of repeat that fails one char later"""
+    pumps = {generate(body)}
+    if len(body) != 1 or (chars := get_chars(str(body[0][0]), body[0][1])) is None:
+        return pumps - {""}
+    shared = [x for x in chars if x in get_first_chars(following)][:RegexSafety.max_shared_chars]
+    for char in shared:
+        pumps.add(char)
+        pumps.update(other + char for other in chars[:RegexSafety.max_shared_chars] if other != char)
+    return pumps - {""}
+
+
+def _is_unbounded(av):
+    return av[1] == sre_parse.MAXREPEAT or av[1] > RegexSafety.unbounded_from
+
+
+def _children(op, av):
+    if op in REPEATS:
+        return (av[2], )
+    if op == "SUBPATTERN":
+        return (av[-1], )
+    if op == "BRANCH":
+        return tuple(av[1])
+    if op == "ATOMIC_GROUP":
+        return (av, )
+    return tuple()
+
+
+def star_height(items):
+    """How deep unbounded quantifiers nest, 2+ is the classic catastrophic backtracking shape"""
+    height = 0
+    for op, av in items:
+        op = str(op)
+        inner = max((star_height(x) for x in _children(op, av)), default=0)
+        if op in REPEATS and _is_unbounded(av):
+            inner += 1
+        height = max(height, inner)
+    return height
+
+
+def attack_points(items, prefix="", following=()):
+    """(prefix, pump) pairs: text that reaches unbounded quantifier and text it repeats on.
+    following is what comes after items in enclosing pattern"""
+    items = list(items)
+    for i, (op, av) in enumerate(items):
+        op = str(op)
+        before = prefix + generate(items[:i])
+        after = items[i + 1:] + list(following)
+        if op in REPEATS and _is_unbounded(av):
+            for pump in get_pumps(list(av[2]), after):
+                yield before, pump
+        for child in _children(op, av):
+            yield from attack_points(child, before, after)
+
+
+def measure(pattern, text):
+    started = time.perf_counter()
+    try:
+        pattern.search(text, timeout=RegexSafety.attempt_timeout)
+    except TimeoutError:
+        return None
+    return time.perf_counter() - started
+
+
+def get_growth(pattern, prefix, pump):
+    """Exponent k of t ~ n^k fitted on log-log timings, inf when matching timed out"""
+    points = list()
+    for size in RegexSafety.sizes:
+        text = prefix + pump * math.ceil(size / len(pump)) + "\x00"
+        if (elapsed := measure(pattern, text)) is None:
+            return math.inf
+        # too fast to tell from timer noise
+        if elapsed >= RegexSafety.min_measurable:
+            points.append((math.log(size), math.log(elapsed)))
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def analyze(pattern_str):
+    """{"star_height", "growth", "worst"}, worst is (prefix, pump) of slowest growth"""
+    parsed = sre_parse.parse(pattern_str, re.MULTILINE)
+    pattern = compile_pattern(pattern_str)
+    result = {"star_height": star_height(parsed), "growth": 0.0, "worst": None}
+    if not supports_timeout():
+        return result
+    for prefix, pump in set(attack_points(parsed)):
+        if (growth := get_growth(pattern, prefix, pump)) > result["growth"]:
+            result["growth"], result["worst"] = growth, (prefix, pump)
+    return result
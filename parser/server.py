@@ -0,0 +1,199 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+from email.utils import formatdate
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+try:
+    from .consts import Network, Server
+    from .main import INSTANCE_GROUPS
+    from .generate_md_json import get_all_json, get_instance_group_json
+except ImportError:
+    from consts import Network, Server
+    from main import INSTANCE_GROUPS
+    from generate_md_json import get_all_json, get_instance_group_json
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class Resource:
+    __slots__ = ("body", "gzipped", "etag", "gzipped_etag")
+
+    def __init__(self, obj):
+        self.body = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        # strong etag belongs to exact bytes, so gzip variant has its own
+        if len(self.body) >= Server.gzip_min_size:
+            self.gzipped = gzip.compress(self.body, mtime=0)
+            self.gzipped_etag = f'"{digest}-gz"'
+        else:
+            self.gzipped = self.gzipped_etag = None
+
+
+class Snapshot:
+    """Lists of all groups as ready to send bytes, never changed after creation"""
+
+    def __init__(self, groups_data):
+        self.resources = dict()
+        self.lists = dict()
+        aggregate = dict()
+        for group in groups_data:
+            path = "/" + group.relative_filepath_without_ext
+            try:
+                aggregate.update(get_all_json([group]))
+                networks = get_instance_group_json(group)
+            except (OSError, ValueError) as e:
+                logger.warning(f"{group.name} not served ({e})")
+                continue
+            self.resources[path + "/all.json"] = Resource(networks)
+            for network, domains in networks.items():
+                self.resources[f"{path}/{network}.json"] = Resource(domains)
+                self.lists[f"{path}/{network}"] = tuple(domains)
+            self.lists[path] = self.lists.get(f"{path}/{Network.CLEARNET}", tuple())
+        self.resources["/all.json"] = Resource(aggregate)
+
+
+class InstancesServer:
+    """Read-only lists from memory: /all.json, /<group path>/all.json, /<group path>/<network>.json
+    and a random domain at /<group path>/random or /<group path>/<network>/random"""
+
+    def __init__(self, groups_data=None, host=Server.host, port=Server.port):
+        self.groups_data = INSTANCE_GROUPS if groups_data is None else groups_data
+        self.host = host
+        self.port = port
+        self.snapshot = Snapshot(self.groups_data)
+        self.server = None
+
+    def reload(self, *_):
+        # single assignment, requests in flight keep the snapshot they started with
+        self.snapshot = Snapshot(self.groups_data)
+        logger.info(f"Server data reloaded, {len(self.snapshot.resources)} resources")
+
+    def get_random(self, path):
+        if (domains := self.snapshot.lists.get(path)) is None:
+            return 404, {}, b""
+        body = json.dumps(random.choice(domains) if domains else None).encode("utf-8")
+        return 200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, body
+
+    def respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        path = urlsplit(target).path.rstrip("/") or "/"
+        if path.endswith("/random"):
+            return self.get_random(path[:-len("/random")])
+        if (resource := self.snapshot.resources.get(path)) is None:
+            return 404, {}, b""
+        body, etag, resp_headers = resource.body, resource.etag, {"Vary": "Accept-Encoding"}
+        if resource.gzipped is not None and accepts_gzip(headers.get("accept-encoding", "")):
+            body, etag = resource.gzipped, resource.gzipped_etag
+            resp_headers["Content-Encoding"] = "gzip"
+        resp_headers["ETag"] = etag
+        if if_none_match(headers.get("if-none-match"), etag):
+            resp_headers.pop("Content-Encoding", None)
+            return 304, resp_headers, b""
+        resp_headers["Content-Type"] = "application/json"
+        return 200, resp_headers, body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    # overlong line comes as ValueError from readline too
+                    if not (request_line := await reader.readline()):
+                        break
+                    method, target, version = request_line.decode("latin-1").split()
+                    headers = await read_headers(reader)
+                    has_body = int(headers.get("content-length") or 0) != 0 or "transfer-encoding" in headers
+                except ValueError:
+                    writer.write(build_response(400, {"Connection": "close"}, b""))
+                    break
+                if has_body:
+                    # nothing here takes a body, so it's never read and connection can't be reused
+                    status, resp_headers = (400, {}) if method in ("GET", "HEAD") else (405, {"Allow": "GET, HEAD"})
+                    writer.write(build_response(status, {**resp_headers, "Connection": "close"}, b""))
+                    break
+                status, resp_headers, body = self.respond(method, target, headers)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if not keep_alive:
+                    resp_headers["Connection"] = "close"
+                writer.write(build_response(status, resp_headers, body, with_body=method != "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Serving instances on http://{self.host}:{self.port}")
+        return self.server
+
+    async def serve_forever(self):
+        async with await self.start():
+            await self.server.serve_forever()
+
+
+async def read_headers(reader):
+    headers = dict()
+    for _ in range(Server.max_header_lines):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise ValueError("Malformed header")
+        headers[name.strip().lower()] = value.strip()
+    raise ValueError("Too many headers")
+
+
+def get_qvalue(params):
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_gzip(accept_encoding):
+    qvalues = dict()
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        qvalues[name.strip()] = get_qvalue(params)
+    # explicit gzip wins over *, whatever their order
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+def if_none_match(header, etag):
+    if not header:
+        return False
+    # If-None-Match compares weakly, W/"x" matches "x"
+    tags = [x.strip().removeprefix("W/") for x in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def build_response(status, headers, body, with_body=True):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Date: {formatdate(usegmt=True)}",
+             f"Content-Length: {len(body)}"]
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + body if with_body else head
+
+
+@logger.catch(reraise=True)
+def run():
+    asyncio.run(InstancesServer().serve_forever())
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,46 @@
+import sys
+
+try:
+    from ..consts import Network
+    from ..utils import get_network, split_by_network
+except ImportError:
+    from parser.consts import Network
+    from parser.utils import get_network, split_by_network
+from loguru import logger
+
+NETWORKS = {
+    "example.com": Network.CLEARNET,
+    "onion.example.com": Network.CLEARNET,  # network is the last label only, not a substring
+    "i2p.onion-mirror.net": Network.CLEARNET,
+    "abc.onion": Network.ONION,
+    "ABC.ONION": Network.ONION,
+    "abc.onion.": Network.ONION,
+    "abc.onion:8080": Network.ONION,
+    "abc.i2p/path": Network.I2P,
+    "abc.loki": Network.LOKI,
+    "1.2.3.4": Network.CLEARNET,
+    "1.2.3.4:8080": Network.CLEARNET,
+}
+
+SPLIT_INPUT = ["https://a.com/", "http://onion.example.com", "http://x.onion/", "https://1.2.3.4/", "https://a.com:8443",
+               "b.i2p", "", None, "https://with.path/page", ("https://c.loki/", {"version": "1"}), ("x.onion", {})]
+SPLIT_EXPECTED = {
+    Network.CLEARNET: ["a.com", "onion.example.com", "1.2.3.4", "a.com:8443"],
+    Network.ONION: ["x.onion", ("x.onion", {})],
+    Network.I2P: ["b.i2p"],
+    Network.LOKI: [("c.loki", {"version": "1"})],
+}
+
+
+if __name__ == '__main__':
+    failed = False
+    for domain, expected in NETWORKS.items():
+        if (network := get_network(domain)) != expected:
+            logger.error(f"{domain}: {network}, expected {expected}")
+            failed = True
+    if (buckets := split_by_network(SPLIT_INPUT)) != SPLIT_EXPECTED:
+        logger.error(f"split_by_network: {buckets}, expected {SPLIT_EXPECTED}")
+        failed = True
+    if not failed:
+        logger.info(f"{len(NETWORKS)} domains and split_by_network are classified right")
+    sys.exit(int(failed))
@@ -1,21 +1,53 @@
-import re
+import math
+import sys
 
 try:
     from ..main import INSTANCE_GROUPS
+    from ..consts import RegexSafety
+    from ..regexsafety import analyze, supports_timeout
 except ImportError:
     from parser.main import INSTANCE_GROUPS
+    from parser.consts import RegexSafety
+    from parser.regexsafety import analyze, supports_timeout
 from loguru import logger
 
 
-if __name__ == '__main__':
-    regex_instances = dict()
+def get_patterns():
+    """pattern: names of instances using it"""
+    patterns = dict()
     for instance_group in INSTANCE_GROUPS:
-        for instance in instance_group.instances:
-            if hasattr(instance, "regex_pattern"):
-                try:
-                    re.compile(instance.regex_pattern, re.MULTILINE)
-                    regex_instances[(instance_group.name, instance.relative_filepath_without_ext)] = True
-                    logger.debug(f"{instance_group.name}/{instance.relative_filepath_without_ext} success!")
-                except Exception as e:
-                    regex_instances[(instance_group.name, instance.relative_filepath_without_ext)] = False
-                    logger.error(f"{instance_group.name}/{instance.relative_filepath_without_ext} error! ({e})")
+        for instance in instance_group.get_instances():
+            if not hasattr(instance, "regex_pattern"):
+                continue
+            name = f"{instance_group.name}/{instance.relative_filepath_without_ext}"
+            items = (instance.regex_pattern, ) if isinstance(instance.regex_pattern, str) else instance.regex_pattern
+            for pattern in items:
+                patterns.setdefault(pattern, list()).append(name)
+    return patterns
+
+
+if __name__ == '__main__':
+    if not supports_timeout():
+        logger.warning("regex isn't installed, only compile and nesting checks are done")
+    failed = False
+    for pattern, names in get_patterns().items():
+        used_by = ", ".join(names)
+        try:
+            result = analyze(pattern)
+        except Exception as e:
+            failed = True
+            logger.error(f"{used_by} error! ({e})")
+            continue
+        growth, worst = result["growth"], result["worst"]
+        worst = f", worst on {worst[0][-20:]!r} + {worst[1]!r} * n" if worst is not None else ""
+        if result["star_height"] >= 2:
+            logger.warning(f"{used_by}: nested unbounded quantifiers")
+        if growth >= RegexSafety.polynomial:
+            failed = True
+            growth = "timeout" if math.isinf(growth) else f"n^{growth:.1f}"
+            logger.error(f"{used_by}: catastrophic ({growth}{worst})\n{pattern}")
+        elif growth >= RegexSafety.linear:
+            logger.warning(f"{used_by}: polynomial (n^{growth:.1f}{worst})")
+        else:
+            logger.debug(f"{used_by}: linear")
+    sys.exit(int(failed))
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+import time
+
+from loguru import logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import InstancesServer  # noqa: E402
+
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 500
+PATHS = ("/all.json", "/youtube/invidious/all.json", "/twitter/nitter/instances.json", "/search/searx/onion.json",
+         "/youtube/piped/random")
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length, etag = 0, None
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "etag":
+            etag = value.strip()
+    await reader.readexactly(length)
+    return status, etag
+
+
+async def client(port, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = dict()
+    for i in range(REQUESTS_PER_CLIENT):
+        path = PATHS[i % len(PATHS)]
+        headers = "Accept-Encoding: gzip\r\n" if i % 2 else ""
+        # every third request revalidates, like a polling consumer would
+        if i % 3 == 0 and (path, bool(i % 2)) in etags:
+            headers += f"If-None-Match: {etags[(path, bool(i % 2))]}\r\n"
+        started = time.perf_counter()
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode("latin-1"))
+        status, etag = await read_response(reader)
+        latencies.append(time.perf_counter() - started)
+        statuses[status] = statuses.get(status, 0) + 1
+        if etag:
+            etags[(path, bool(i % 2))] = etag
+    writer.close()
+
+
+async def bench():
+    server = InstancesServer(port=0)
+    latencies, statuses = list(), dict()
+    async with await server.start():
+        started = time.perf_counter()
+        await asyncio.gather(*(client(server.port, latencies, statuses) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    logger.info(f"{len(latencies)} requests by {CLIENTS} clients in {elapsed:.2f}s: {len(latencies) / elapsed:.0f} req/s")
+    logger.info(f"p50 {latencies[len(latencies) // 2] * 1000:.2f}ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f}ms")
+    logger.info("statuses: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items())))
+    return statuses
+
+
+if __name__ == '__main__':
+    result = asyncio.run(bench())
+    sys.exit(int(set(result) - {200, 304} != set()))
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+from loguru import logger
+
+PARSER_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# startup must not pull these, they're imported only when something's fetched
+LAZY_MODULES = ("httpx", "httpcore")
+RUNS = 5
+
+
+def importtime(code, env=None):
+    """Returns {module: cumulative microseconds} from `python -X importtime`"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PARSER_PATH, capture_output=True,
+                          text=True, env={**os.environ, **(env or {})}, check=True)
+    modules = dict()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+if __name__ == '__main__':
+    env = {"FIL_GROUPS_ONLY": "nitter"}
+    code = "import main; main.get_instance_group('nitter').from_instance()"
+    runs = [importtime(code, env) for _ in range(RUNS)]
+    best = min(runs, key=lambda x: x["main"])
+    # wall time depends on machine, so it's reported next to deps main can't avoid rather than checked
+    baseline = min(sum(importtime("import asyncio, json, loguru").get(x, 0) for x in ("asyncio", "json", "loguru"))
+                   for _ in range(RUNS))
+    logger.info(f"import main: {best['main'] / 1000:.1f}ms (best of {RUNS}), "
+                f"asyncio + json + loguru alone: {baseline / 1000:.1f}ms")
+    for name, us in sorted(best.items(), key=lambda x: -x[1])[:10]:
+        logger.debug(f"{name}: {us / 1000:.1f}ms")
+    failed = False
+    if lazy := [name for name in best if name.split(".")[0] in LAZY_MODULES]:
+        logger.error("Imported on startup: " + ", ".join(sorted(lazy)))
+        failed = True
+    sys.exit(int(failed))
@@ -1,16 +1,75 @@
 import os
+from urllib.parse import urlparse
 
 from loguru import logger
 
 try:
-    from .consts import Regex, HOME_PATH
+    from .consts import Regex, HOME_PATH, Network, NETWORK_TLDS, ENABLE_PATH_IN_DOMAINS, IGNORE_DOMAINS_WITH_PATHS
 except ImportError:
-    from consts import Regex, HOME_PATH
+    from consts import Regex, HOME_PATH, Network, NETWORK_TLDS, ENABLE_PATH_IN_DOMAINS, IGNORE_DOMAINS_WITH_PATHS
 
 
 CONSTS_FILE = os.path.join(HOME_PATH, "parser", "consts.py")
 
 
+def get_domain_from_url(url):
+    parsed = urlparse(url)
+    url_has_path = parsed.path not in ("", "/", None)
+    if not url_has_path:
+        return parsed.netloc
+    elif url_has_path and IGNORE_DOMAINS_WITH_PATHS:
+        return False
+    if url_has_path and ENABLE_PATH_IN_DOMAINS:
+        return parsed.netloc + parsed.path
+    else:
+        return parsed.netloc
+
+
+class SuffixTrie:
+    """Domain suffixes stored by labels from the right, lookup walks the domain once"""
+
+    def __init__(self, suffixes: dict):
+        self.root = dict()
+        for suffix, value in suffixes.items():
+            self.add(suffix, value)
+
+    def add(self, suffix, value):
+        node = self.root
+        for label in reversed(suffix.strip(".").lower().split(".")):
+            node = node.setdefault(label, dict())
+        node[None] = value  # labels are never None, so it's safe as value slot
+
+    def lookup(self, domain, default=None):
+        """Value of the longest suffix domain ends with"""
+        node, value = self.root, default
+        for label in reversed(domain.rstrip(".").lower().split(".")):
+            if (node := node.get(label)) is None:
+                break
+            value = node.get(None, value)
+        return value
+
+
+NETWORKS_TRIE = SuffixTrie(NETWORK_TLDS)
+
+
+def get_network(domain):
+    host = domain.split("/")[0].rsplit(":", 1)[0]  # port and path don't matter
+    return NETWORKS_TRIE.lookup(host, default=Network.CLEARNET)
+
+
+def split_by_network(urls):
+    """URLs or bare domains to {network: [domain, ...]} in one pass, (url, meta) pairs stay (domain, meta)"""
+    buckets = {Network.CLEARNET: list(), Network.ONION: list(), Network.I2P: list(), Network.LOKI: list()}
+    for item in urls:
+        url, meta = item if isinstance(item, tuple) else (item, None)
+        if not url:
+            continue
+        domain = get_domain_from_url(url) if "://" in url else url
+        if domain:
+            buckets[get_network(domain)].append(domain if meta is None else (domain, meta))
+    return buckets
+
+
 def add_regex_to_comments():
     with open(CONSTS_FILE, mode="r") as f:
         data = f.read()